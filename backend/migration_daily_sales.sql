@@ -0,0 +1,23 @@
+-- ========================================
+-- DAILY SALES ROLLUP TABLE
+-- One row per closed business day (Asia/Manila), written by the app's
+-- rollup job; /api/admin/reports reads only this table.
+-- Run this in Supabase SQL Editor
+-- ========================================
+
+CREATE TABLE IF NOT EXISTS daily_sales (
+    day           DATE PRIMARY KEY,
+    order_count   INT NOT NULL DEFAULT 0,
+    revenue       NUMERIC(12,2) NOT NULL DEFAULT 0,
+    items         JSONB NOT NULL DEFAULT '{}',   -- { item name: quantity }
+    payments      JSONB NOT NULL DEFAULT '{}',   -- { method: { count, total } }
+    updated_at    TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE OR REPLACE TRIGGER daily_sales_updated_at
+    BEFORE UPDATE ON daily_sales
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at();
+
+-- Range scans for the rollup job and reports
+CREATE INDEX IF NOT EXISTS idx_orders_created_at ON orders (created_at);
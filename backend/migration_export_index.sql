@@ -0,0 +1,9 @@
+-- ========================================
+-- Keyset index for the order history export
+-- Run this in Supabase SQL Editor
+-- ========================================
+
+-- The export pages by (created_at, id); this index serves each page as a
+-- range scan and also covers the plain created_at lookups.
+CREATE INDEX IF NOT EXISTS idx_orders_created_at_id ON orders (created_at, id);
+DROP INDEX IF EXISTS idx_orders_created_at;
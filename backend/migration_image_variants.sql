@@ -0,0 +1,7 @@
+-- ========================================
+-- Add resized image variants to menu items
+-- Run this in Supabase SQL Editor
+-- ========================================
+
+-- { "srcset": [{ "w": 320, "url": "..." }, ...], "placeholder": "data:image/webp;base64,..." }
+ALTER TABLE menu_items ADD COLUMN IF NOT EXISTS image_variants JSONB;
@@ -0,0 +1,8 @@
+-- ========================================
+-- Index for the kitchen's delta feed
+-- Run this in Supabase SQL Editor
+-- ========================================
+
+-- GET /api/orders?since= filters and sorts on updated_at; without this
+-- index every poll scans the whole (ever-growing) orders table.
+CREATE INDEX IF NOT EXISTS idx_orders_updated_at ON orders (updated_at);
@@ -0,0 +1,136 @@
+import os
+from collections import Counter
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+# Business day boundaries follow the restaurant's local time, not UTC
+BUSINESS_TZ = ZoneInfo(os.getenv("BUSINESS_TZ", "Asia/Manila"))
+TOP_ITEMS = 10
+
+
+def business_date(ts: str | datetime = None):
+    """Local business date of an ISO timestamp (or of now)."""
+    if ts is None:
+        return datetime.now(BUSINESS_TZ).date()
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts)
+    return ts.astimezone(BUSINESS_TZ).date()
+
+
+class DailyAnalytics:
+    """Today's dashboard counters, maintained incrementally per order write.
+
+    Each order's last contribution is remembered, so an update subtracts
+    the old figures and adds the new ones instead of rescanning the day.
+    """
+
+    def __init__(self):
+        self.day = None
+        self.seeded_at: float | None = None
+        self._contrib: dict[int, tuple] = {}
+        self._reset()
+
+    def _reset(self):
+        self.by_status = Counter()
+        self.by_payment = {}
+        self.by_hour = Counter()
+        self.items = Counter()
+        self.revenue = 0.0
+        self.count = 0
+        self._contrib = {}
+
+    def seed(self, orders: list, day=None, seeded_at: float = None):
+        """Rebuild from the full list of the day's orders."""
+        self._reset()
+        self.day = day or business_date()
+        self.seeded_at = seeded_at
+        for order in orders:
+            self.apply(order)
+
+    def _contribution(self, order: dict):
+        created = datetime.fromisoformat(order["created_at"]).astimezone(BUSINESS_TZ)
+        items = tuple(
+            (item.get("name") or "?", int(item.get("quantity") or 0))
+            for item in (order.get("items") or [])
+        )
+        return (order["status"], order.get("payment_method") or "cash",
+                float(order.get("total") or 0), created.hour, items)
+
+    def _add(self, contrib: tuple, sign: int):
+        status, method, total, hour, items = contrib
+        self.count += sign
+        self.revenue += sign * total
+        self.by_status[status] += sign
+        bucket = self.by_payment.setdefault(method, {"count": 0, "total": 0.0})
+        bucket["count"] += sign
+        bucket["total"] += sign * total
+        self.by_hour[hour] += sign
+        for name, qty in items:
+            self.items[name] += sign * qty
+
+    def apply(self, order: dict):
+        """Fold a created or updated order row into today's counters."""
+        if not order.get("created_at") or order.get("id") is None:
+            return
+        if business_date(order["created_at"]) != self.day:
+            return
+        new = self._contribution(order)
+        old = self._contrib.get(order["id"])
+        if old == new:
+            return
+        if old is not None:
+            self._add(old, -1)
+        self._add(new, +1)
+        self._contrib[order["id"]] = new
+
+    def rollup_row(self) -> dict:
+        """This day's totals in the daily_sales table shape."""
+        return {
+            "day": self.day.isoformat(),
+            "order_count": self.count,
+            "revenue": round(self.revenue, 2),
+            "items": {n: q for n, q in self.items.items() if q > 0},
+            "payments": {k: {"count": v["count"], "total": round(v["total"], 2)}
+                         for k, v in self.by_payment.items() if v["count"]},
+        }
+
+    def summary(self) -> dict:
+        delivered = self.by_status.get("delivered", 0)
+        return {
+            "day": self.day.isoformat() if self.day else None,
+            "count": self.count,
+            "revenue": round(self.revenue, 2),
+            "average_ticket": round(self.revenue / self.count, 2) if self.count else 0.0,
+            "active": self.count - delivered,
+            "delivered": delivered,
+            "by_status": {k: v for k, v in self.by_status.items() if v},
+            "by_payment": {k: {"count": v["count"], "total": round(v["total"], 2)}
+                           for k, v in self.by_payment.items() if v["count"]},
+            "by_hour": {str(h): n for h, n in sorted(self.by_hour.items()) if n},
+            "top_items": [{"name": n, "quantity": q}
+                          for n, q in self.items.most_common(TOP_ITEMS) if q > 0],
+        }
+
+
+def combine_rollups(rows: list) -> dict:
+    """Totals across daily_sales rows for a report range."""
+    items = Counter()
+    payments = {}
+    revenue = 0.0
+    count = 0
+    for row in rows:
+        count += row["order_count"]
+        revenue += float(row["revenue"])
+        items.update(row.get("items") or {})
+        for method, p in (row.get("payments") or {}).items():
+            bucket = payments.setdefault(method, {"count": 0, "total": 0.0})
+            bucket["count"] += p["count"]
+            bucket["total"] += float(p["total"])
+    return {
+        "days": len(rows),
+        "order_count": count,
+        "revenue": round(revenue, 2),
+        "average_ticket": round(revenue / count, 2) if count else 0.0,
+        "payments": {k: {"count": v["count"], "total": round(v["total"], 2)} for k, v in payments.items()},
+        "top_items": [{"name": n, "quantity": q} for n, q in items.most_common(TOP_ITEMS)],
+    }
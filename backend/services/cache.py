@@ -0,0 +1,85 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import functools
+
+# Read-through TTL cache for the small, rarely-written catalog tables
+# (menu, categories, settings). Writes invalidate explicitly; the TTL only
+# bounds staleness if something edits the tables outside this process.
+# Expired and invalidated values are kept as a fallback: if the reload
+# fails (database down, circuit open) the last known value is served.
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+
+_entries: dict[str, tuple[float, object]] = {}
+# Bumped by invalidate(); a load that straddles a write must not be cached
+_generations: dict[str, int] = {}
+_stats = {"hits": 0, "misses": 0, "invalidations": 0, "stale_served": 0}
+
+# Serialized JSON + ETag per key, reused while the cached value is unchanged
+_encoded: dict[str, tuple[object, bytes, str]] = {}
+
+log = logging.getLogger(__name__)
+
+
+def cached(key: str, ttl: float = None):
+    """Cache the result of an argument-less async loader under `key`."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper():
+            entry = _entries.get(key)
+            now = time.monotonic()
+            if entry and entry[0] > now:
+                _stats["hits"] += 1
+                return entry[1]
+            _stats["misses"] += 1
+            generation = _generations.get(key, 0)
+            try:
+                value = await fn()
+            except Exception:
+                if entry is None:
+                    raise
+                log.warning("serving stale %s after failed reload", key, exc_info=True)
+                _stats["stale_served"] += 1
+                return entry[1]
+            if _generations.get(key, 0) != generation:
+                return value  # invalidated mid-load: may predate the write
+            _entries[key] = (now + (CACHE_TTL_SECONDS if ttl is None else ttl), value)
+            return value
+        wrapper.cache_key = key
+        return wrapper
+    return decorator
+
+
+def invalidate(*keys: str):
+    """Drop cached entries so the next read goes to the database."""
+    for key in keys:
+        _generations[key] = _generations.get(key, 0) + 1
+        _encoded.pop(key, None)
+        entry = _entries.get(key)
+        if entry is not None and entry[0] > 0:
+            _entries[key] = (0.0, entry[1])  # expired, kept as fallback
+            _stats["invalidations"] += 1
+
+
+def encoded(key: str, value) -> tuple[bytes, str]:
+    """Return (json_bytes, etag) for a cached value, serializing it once."""
+    memo = _encoded.get(key)
+    if memo and memo[0] is value:
+        return memo[1], memo[2]
+    body = json.dumps(value, ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(",", ":")).encode("utf-8")
+    etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+    _encoded[key] = (value, body, etag)
+    return body, etag
+
+
+def cache_stats():
+    total = _stats["hits"] + _stats["misses"]
+    return {
+        **_stats,
+        "hit_ratio": round(_stats["hits"] / total, 4) if total else 0.0,
+        "keys": sorted(k for k, (expires, _) in _entries.items() if expires > time.monotonic()),
+        "ttl_seconds": CACHE_TTL_SECONDS,
+    }
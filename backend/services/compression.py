@@ -0,0 +1,154 @@
+import os
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+from backend.services.routes import route_template
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Negotiated gzip/brotli for API JSON and HTML pages. Media and anything
+# already encoded (precompressed assets) pass through untouched, as do SSE
+# streams, which must reach the client frame by frame.
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "512"))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4  # fast enough to run per response
+
+SKIP_CONTENT_TYPES = (
+    "image/", "video/", "audio/", "font/woff", "text/event-stream",
+    "application/zip", "application/gzip", "application/x-brotli",
+    "application/octet-stream", "application/pdf",
+)
+
+# Per-route ratios: route -> counters
+_stats: dict[str, dict] = {}
+
+
+def accepted_encodings(header: str) -> set[str]:
+    """Content codings from an Accept-Encoding header, minus q=0 ones."""
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def negotiate(header: str) -> str | None:
+    accepted = accepted_encodings(header)
+    if brotli and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def precompress(body: bytes) -> dict[str, bytes]:
+    """Encodings of a static body, keyed by content coding, for reuse."""
+    encoded = {"gzip": zlib.compress(body, 9, wbits=31)}
+    if brotli:
+        encoded["br"] = brotli.compress(body, quality=11)
+    return encoded
+
+
+class _Encoder:
+    def __init__(self, coding: str):
+        if coding == "br":
+            self._c = brotli.Compressor(quality=BROTLI_QUALITY)
+            self.process, self._finish = self._c.process, self._c.finish
+        else:
+            self._c = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+            self.process, self._finish = self._c.compress, self._c.flush
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+def _record(route: str, raw: int, sent: int, compressed: bool):
+    s = _stats.setdefault(route, {"responses": 0, "compressed": 0, "bytes_in": 0, "bytes_out": 0})
+    s["responses"] += 1
+    s["compressed"] += int(compressed)
+    s["bytes_in"] += raw
+    s["bytes_out"] += sent
+
+
+def compression_stats():
+    return {
+        route: {**s, "ratio": round(s["bytes_out"] / s["bytes_in"], 4) if s["bytes_in"] else 1.0}
+        for route, s in sorted(_stats.items())
+    }
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        coding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if coding is None:
+            return await self.app(scope, receive, send)
+
+        start = None
+        encoder = None
+        passthrough = False
+        raw = sent = 0
+
+        async def send_wrapper(message):
+            nonlocal start, encoder, passthrough, raw, sent
+            if message["type"] == "http.response.start":
+                start = message
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                passthrough = (
+                    "content-encoding" in headers
+                    or message["status"] in (204, 304)
+                    or content_type.startswith(SKIP_CONTENT_TYPES)
+                )
+                if passthrough:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                return await send(message)
+
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+            raw += len(body)
+
+            if encoder is None and start is not None:
+                if not more and len(body) < self.minimum_size:
+                    # Small, complete body: not worth compressing
+                    await send(start)
+                    start = None
+                    passthrough = True
+                    _record(route_template(scope), raw, raw, False)
+                    return await send(message)
+                encoder = _Encoder(coding)
+                headers = MutableHeaders(raw=start["headers"])
+                headers["Content-Encoding"] = coding
+                headers.add_vary_header("Accept-Encoding")
+                if more:
+                    del headers["Content-Length"]
+                else:
+                    out = encoder.process(body) + encoder.finish()
+                    headers["Content-Length"] = str(len(out))
+                    await send(start)
+                    start = None
+                    _record(route_template(scope), raw, len(out), True)
+                    return await send({"type": "http.response.body", "body": out})
+                await send(start)
+                start = None
+
+            chunk = encoder.process(body)
+            if not more:
+                chunk += encoder.finish()
+            sent += len(chunk)
+            if not more:
+                _record(route_template(scope), raw, sent, True)
+            await send({"type": "http.response.body", "body": chunk, "more_body": more})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,117 @@
+import asyncio
+import json
+import time
+from collections import deque
+
+# In-process order event bus feeding the SSE streams.
+# Event ids are "<epoch>-<seq>": the epoch changes on every restart, so a
+# client resuming with a stale Last-Event-ID gets a "reset" and refetches.
+HEARTBEAT_SECONDS = 15
+BUFFER_SIZE = 1000
+
+
+class EventBus:
+    def __init__(self, maxlen: int = BUFFER_SIZE, key_field: str = None):
+        self.epoch = format(int(time.time() * 1000), "x")
+        self.key_field = key_field
+        self._seq = 0
+        self._buffer: deque[tuple[int, str, dict]] = deque(maxlen=maxlen)
+        self._subscribers: set[asyncio.Queue] = set()
+        # Keyed subscribers (e.g. one tenant's tracking token) are only woken
+        # for their own events, so publishing stays O(1) in watched orders
+        self._keyed: dict[str, set[asyncio.Queue]] = {}
+
+    def publish(self, event: str, data: dict):
+        """Record an event and wake every matching subscriber."""
+        self._seq += 1
+        item = (self._seq, event, data)
+        self._buffer.append(item)
+        for queue in self._subscribers:
+            queue.put_nowait(item)
+        if self.key_field and self._keyed:
+            for queue in self._keyed.get(data.get(self.key_field), ()):
+                queue.put_nowait(item)
+
+    def cursor(self) -> str:
+        """Id of the latest event; pass to subscribe() to resume from now."""
+        return self.event_id(self._seq)
+
+    def events_after(self, last_event_id: str) -> list[tuple[int, str, dict]] | None:
+        """Buffered events newer than `last_event_id`, or None if it's too old."""
+        cursor = self._parse_cursor(last_event_id)
+        if cursor is None:
+            return None
+        return [item for item in self._buffer if item[0] > cursor]
+
+    def _parse_cursor(self, last_event_id: str | None):
+        """Return the seq to resume after, or None if the client must reset."""
+        if not last_event_id:
+            return self._seq
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        seq = int(seq)
+        oldest = self._buffer[0][0] if self._buffer else self._seq + 1
+        if seq > self._seq or seq < oldest - 1:
+            return None
+        return seq
+
+    async def subscribe(self, last_event_id: str | None = None, key: str = None):
+        """Yield (id, event, data) tuples; None is yielded as a heartbeat.
+
+        With `key`, only events whose `key_field` equals it are delivered.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        if key is None:
+            self._subscribers.add(queue)
+        else:
+            self._keyed.setdefault(key, set()).add(queue)
+        try:
+            cursor = self._parse_cursor(last_event_id)
+            if cursor is None:
+                cursor = self._seq
+                yield self.event_id(cursor), "reset", {}
+            for seq, event, data in list(self._buffer):
+                if key is not None and data.get(self.key_field) != key:
+                    continue
+                if seq > cursor:
+                    cursor = seq
+                    yield self.event_id(seq), event, data
+            while True:
+                try:
+                    seq, event, data = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if seq > cursor:
+                    cursor = seq
+                    yield self.event_id(seq), event, data
+        finally:
+            if key is None:
+                self._subscribers.discard(queue)
+            else:
+                watchers = self._keyed.get(key)
+                if watchers is not None:
+                    watchers.discard(queue)
+                    if not watchers:
+                        del self._keyed[key]
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers) + sum(len(q) for q in self._keyed.values())
+
+
+order_events = EventBus(key_field="tracking_token")
+
+
+def format_sse(item) -> str:
+    """Serialize a subscribe() item into an SSE frame."""
+    if item is None:
+        return ": keep-alive\n\n"
+    event_id, event, data = item
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    frame = f"event: {event}\ndata: {payload}\n\n"
+    return f"id: {event_id}\n{frame}" if event_id else frame
@@ -0,0 +1,45 @@
+import io
+import base64
+
+try:
+    from PIL import Image, ImageFilter, ImageOps
+except ImportError:  # derivatives are skipped; the original is still stored
+    Image = None
+
+# Widths of the WebP variants generated at upload time. Thumbnails render at
+# 96px on phones and ~300px in the grid, so these cover 1x-2x densities.
+VARIANT_WIDTHS = (160, 320, 640)
+VARIANT_QUALITY = 75
+PLACEHOLDER_WIDTH = 16
+
+
+def _encode(img, quality: int) -> bytes:
+    buf = io.BytesIO()
+    img.save(buf, format="WEBP", quality=quality, method=4)
+    return buf.getvalue()
+
+
+def build_image_variants(file_bytes: bytes, ext: str):
+    """Resize an uploaded image into width-bounded WebP variants.
+
+    Returns ([(width, webp_bytes), ...], placeholder_data_uri), or None when
+    Pillow is unavailable or the file is an (animated) GIF. CPU-bound: run
+    it in a worker thread.
+    """
+    if Image is None or ext == ".gif":
+        return None
+
+    with Image.open(io.BytesIO(file_bytes)) as src:
+        img = ImageOps.exif_transpose(src)
+        img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+
+    widths = [w for w in VARIANT_WIDTHS if w < img.width] or [img.width]
+    variants = []
+    for width in widths:
+        height = max(1, round(img.height * width / img.width))
+        variants.append((width, _encode(img.resize((width, height), Image.LANCZOS), VARIANT_QUALITY)))
+
+    tiny_h = max(1, round(img.height * PLACEHOLDER_WIDTH / img.width))
+    tiny = img.resize((PLACEHOLDER_WIDTH, tiny_h), Image.BILINEAR).filter(ImageFilter.GaussianBlur(1))
+    placeholder = "data:image/webp;base64," + base64.b64encode(_encode(tiny, 30)).decode()
+    return variants, placeholder
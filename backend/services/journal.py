@@ -0,0 +1,133 @@
+import os
+import json
+import time
+import sqlite3
+import asyncio
+import threading
+
+# Write-behind order intake: checkout appends the validated order row here
+# (SQLite in WAL mode, fsynced per commit) and returns at once; a background
+# worker drains the journal into Supabase. Rows are only deleted after the
+# insert is confirmed, so anything still here at startup is simply replayed.
+# A row the database rejects outright is moved to rejected_orders, kept for
+# inspection, so it can't sit at the head of the queue blocking the rest.
+JOURNAL_PATH = os.getenv("ORDER_JOURNAL_PATH", os.path.join("data", "order_journal.db"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_orders (
+    seq            INTEGER PRIMARY KEY AUTOINCREMENT,
+    tracking_token TEXT NOT NULL UNIQUE,
+    row            TEXT NOT NULL,
+    queued_at      REAL NOT NULL,
+    attempts       INTEGER NOT NULL DEFAULT 0,
+    last_error     TEXT
+);
+CREATE TABLE IF NOT EXISTS rejected_orders (
+    seq            INTEGER PRIMARY KEY,
+    tracking_token TEXT NOT NULL,
+    row            TEXT NOT NULL,
+    queued_at      REAL NOT NULL,
+    rejected_at    REAL NOT NULL,
+    error          TEXT NOT NULL
+);
+"""
+
+
+class OrderJournal:
+    """Append-only queue of orders not yet confirmed by the database."""
+
+    def __init__(self, path: str = JOURNAL_PATH):
+        self.path = path
+        self._db = None
+        self._lock = threading.Lock()
+        self.flushed = 0
+        self.rejected = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=FULL")  # an acknowledged order survives power loss
+            db.execute("PRAGMA busy_timeout=5000")  # workers share the file
+            db.executescript(_SCHEMA)
+            self._db = db
+        return self._db
+
+    def _run(self, fn, *args):
+        with self._lock:
+            return fn(self._conn(), *args)
+
+    # Blocking primitives; the async wrappers below run them off the loop.
+
+    @staticmethod
+    def _append(db, row: dict):
+        db.execute(
+            "INSERT INTO pending_orders (tracking_token, row, queued_at) VALUES (?, ?, ?)",
+            (row["tracking_token"], json.dumps(row, ensure_ascii=False), time.time()),
+        )
+
+    @staticmethod
+    def _batch(db, limit: int):
+        cur = db.execute("SELECT seq, row FROM pending_orders ORDER BY seq LIMIT ?", (limit,))
+        return [(seq, json.loads(row)) for seq, row in cur.fetchall()]
+
+    @staticmethod
+    def _remove(db, seqs: list):
+        db.executemany("DELETE FROM pending_orders WHERE seq = ?", [(s,) for s in seqs])
+
+    @staticmethod
+    def _reject(db, seqs: list, error: str):
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.executemany(
+                "INSERT OR REPLACE INTO rejected_orders (seq, tracking_token, row, queued_at, rejected_at, error) "
+                "SELECT seq, tracking_token, row, queued_at, ?, ? FROM pending_orders WHERE seq = ?",
+                [(time.time(), error, s) for s in seqs],
+            )
+            db.executemany("DELETE FROM pending_orders WHERE seq = ?", [(s,) for s in seqs])
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _get(db, token: str):
+        cur = db.execute("SELECT row FROM pending_orders WHERE tracking_token = ?", (token,))
+        found = cur.fetchone()
+        return json.loads(found[0]) if found else None
+
+    @staticmethod
+    def _stats(db):
+        count, oldest = db.execute("SELECT COUNT(*), MIN(queued_at) FROM pending_orders").fetchone()
+        rejected = db.execute("SELECT COUNT(*) FROM rejected_orders").fetchone()[0]
+        return count, oldest, rejected
+
+    async def append(self, row: dict):
+        await asyncio.to_thread(self._run, self._append, row)
+
+    async def batch(self, limit: int) -> list[tuple[int, dict]]:
+        return await asyncio.to_thread(self._run, self._batch, limit)
+
+    async def remove(self, seqs: list):
+        await asyncio.to_thread(self._run, self._remove, seqs)
+        self.flushed += len(seqs)
+
+    async def reject(self, seqs: list, error: str):
+        """Move rows the database refused out of the queue, keeping them."""
+        await asyncio.to_thread(self._run, self._reject, seqs, error[:500])
+        self.rejected += len(seqs)
+
+    async def get(self, token: str) -> dict | None:
+        return await asyncio.to_thread(self._run, self._get, token)
+
+    def stats(self) -> dict:
+        count, oldest, rejected = self._run(self._stats)
+        return {
+            "pending": count,
+            "oldest_age_seconds": round(time.time() - oldest, 1) if oldest else 0.0,
+            "rejected": rejected,
+            "flushed": self.flushed,
+            "rejected_since_start": self.rejected,
+        }
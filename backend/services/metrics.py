@@ -0,0 +1,236 @@
+import os
+import time
+import inspect
+import functools
+from bisect import bisect_left
+from backend.services.routes import route_template
+from backend.services.tracing import span
+
+# Prometheus-style metrics kept in process and rendered in the text
+# exposition format on /metrics. Recording is a dict lookup, a bisect over
+# the bucket bounds and a few integer adds on the event loop -- no locks,
+# no label formatting -- so it can stay on in production. Buckets hold
+# per-bucket counts and are made cumulative only when scraped.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")  # optional bearer token for /metrics
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_metrics: list = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, doc: str, labels: tuple = ()):
+        self.name, self.doc, self.labelnames = name, doc, tuple(labels)
+        self._children: dict[tuple, object] = {}
+        _metrics.append(self)
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._child()
+        return child
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines += self._samples(values, child)
+        return lines
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+
+class Counter(_Metric):
+    kind = "counter"
+    _child = _Value
+
+    def _samples(self, values, child):
+        return [f"{self.name}{_labels(self.labelnames, values)} {_number(child.value)}"]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+
+class _Buckets:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.sum += seconds
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def _child(self):
+        return _Buckets(self.buckets)
+
+    def _samples(self, values, child):
+        lines, total = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+            total += count
+            le = 'le="' + _number(bound) + '"'
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, values, le)} {total}")
+        lines.append(f"{self.name}_sum{_labels(self.labelnames, values)} {_number(child.sum)}")
+        lines.append(f"{self.name}_count{_labels(self.labelnames, values)} {total}")
+        return lines
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in _metrics:
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+
+# ========================================
+# HTTP requests
+# ========================================
+
+http_requests = Counter("http_requests_total", "HTTP requests by route template and status.",
+                        ("method", "route", "status"))
+http_latency = Histogram("http_request_duration_seconds",
+                         "Time from request start until the response is fully sent.", ("method", "route"))
+http_in_flight = Gauge("http_requests_in_flight", "Requests currently being handled.", ("method", "route"))
+
+# Requests in progress. The route is only known once the router has run, so
+# in-flight gauges are filled in from these scopes at scrape time instead.
+_live: dict[int, dict] = {}
+
+
+def _collect_in_flight():
+    for child in http_in_flight._children.values():
+        child.value = 0
+    for scope in list(_live.values()):
+        route = route_template(scope) if "endpoint" in scope or scope.get("root_path") else "<routing>"
+        http_in_flight.labels(scope["method"], route).inc()
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        key = id(scope)
+        _live[key] = scope
+        began = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - began
+            del _live[key]
+            method, route = scope["method"], route_template(scope)
+            http_latency.labels(method, route).observe(elapsed)
+            http_requests.labels(method, route, status).inc()
+
+
+def metrics_text() -> str:
+    _collect_in_flight()
+    return render_metrics()
+
+
+# ========================================
+# Service calls
+# ========================================
+
+service_latency = Histogram("service_call_duration_seconds",
+                            "Latency of service-layer calls (database, storage, caches).", ("function",))
+service_errors = Counter("service_call_errors_total",
+                         "Service-layer calls that raised, by exception type.", ("function", "error"))
+
+
+def timed(fn):
+    """Record latency and errors of a service function under its own name.
+
+    Inside a traced request each call is also a span, the parent of the
+    database calls it makes.
+
+    Async generators are timed per item, so a paged export reports the
+    cost of each page fetch rather than how long the client took to read.
+    """
+    name = fn.__name__
+    latency = service_latency.labels(name)
+
+    if inspect.isasyncgenfunction(fn):
+        @functools.wraps(fn)
+        async def gen_wrapper(*args, **kwargs):
+            agen = fn(*args, **kwargs)
+            try:
+                while True:
+                    began = time.perf_counter()
+                    try:
+                        with span(name):
+                            item = await agen.__anext__()
+                    except StopAsyncIteration:
+                        return
+                    except Exception as exc:
+                        service_errors.labels(name, type(exc).__name__).inc()
+                        raise
+                    finally:
+                        latency.observe(time.perf_counter() - began)
+                    yield item
+            finally:
+                await agen.aclose()
+        return gen_wrapper
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        began = time.perf_counter()
+        try:
+            with span(name):
+                return await fn(*args, **kwargs)
+        except Exception as exc:
+            service_errors.labels(name, type(exc).__name__).inc()
+            raise
+        finally:
+            latency.observe(time.perf_counter() - began)
+    return wrapper
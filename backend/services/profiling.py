@@ -0,0 +1,189 @@
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import threading
+from datetime import datetime, timezone
+
+# On-demand wall-clock profiling of a single request. An admin sends
+# `X-Profile: speedscope` (or `collapsed`) with a valid admin token; the
+# request then runs with a sampler thread that, every PROFILE_INTERVAL_MS,
+# records where that request is: the live stack of the loop thread while
+# its task is running, or the chain of awaits it is parked on otherwise
+# (so time waiting on the database shows up as well as CPU). The profile
+# is written to PROFILE_DIR when the response has been sent, and the
+# X-Profile-Url response header names it. Requests without the header
+# pay one scan of the header list and nothing else.
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join("data", "profiles"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+PROFILE_URL = "/api/admin/profiles"
+PROFILE_FORMATS = {"speedscope": ".speedscope.json", "collapsed": ".collapsed"}
+
+_NAME_RE = re.compile(r"^[\w.-]+$")
+_busy = threading.Lock()  # one profile at a time keeps the sampler's cost bounded
+_labels: dict = {}  # code object -> (name, file, line), so samples stay cheap
+
+
+def profile_path(name: str) -> str | None:
+    """Path of a saved profile, or None for unknown or unsafe names."""
+    if not _NAME_RE.match(name):
+        return None
+    path = os.path.join(PROFILE_DIR, name)
+    return path if os.path.isfile(path) else None
+
+
+def _label(code) -> tuple[str, str, int]:
+    label = _labels.get(code)
+    if label is None:
+        label = _labels[code] = (code.co_qualname, os.path.relpath(code.co_filename), code.co_firstlineno)
+    return label
+
+
+def _await_chain(coro) -> list:
+    """Frames of a suspended coroutine and everything it awaits, outermost first."""
+    stack = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is None:
+            if not hasattr(coro, "cr_frame") and not hasattr(coro, "gi_frame"):
+                kind = "Future" if type(coro).__name__ == "FutureIter" else type(coro).__name__
+                stack.append((f"<await {kind}>", "", 0))
+            break
+        stack.append(_label(frame.f_code))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None) or getattr(coro, "ag_await", None)
+    return stack
+
+
+class Sampler(threading.Thread):
+    """Samples one task on one loop thread until stopped."""
+
+    def __init__(self, task: asyncio.Task, loop, loop_thread: int, root_code, interval: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.task, self.loop, self.loop_thread = task, loop, loop_thread
+        self.root = _label(root_code)
+        self.interval = interval
+        self.samples: list[tuple[tuple, float]] = []
+        self.stopped = threading.Event()
+
+    def _stack(self) -> tuple:
+        if asyncio.current_task(self.loop) is self.task:
+            frame = sys._current_frames().get(self.loop_thread)
+            stack = []
+            while frame is not None:
+                stack.append(frame)
+                frame = frame.f_back
+            stack = [_label(f.f_code) for f in reversed(stack)]
+        else:
+            stack = _await_chain(self.task.get_coro())
+        # Drop the server and event-loop frames below the middleware
+        if self.root in stack:
+            stack = stack[stack.index(self.root):]
+        return tuple(stack)
+
+    def run(self):
+        last = time.perf_counter()
+        while not self.stopped.wait(self.interval):
+            now = time.perf_counter()
+            self.samples.append((self._stack(), now - last))
+            last = now
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def _speedscope(samples: list, name: str) -> str:
+    frames, index, stacks, weights = [], {}, [], []
+    for stack, weight in samples:
+        ids = []
+        for frame in stack:
+            if frame not in index:
+                index[frame] = len(frames)
+                frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+            ids.append(index[frame])
+        stacks.append(ids)
+        weights.append(round(weight * 1000, 3))
+    return json.dumps({
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled", "name": name, "unit": "milliseconds",
+            "startValue": 0, "endValue": round(sum(weights), 3),
+            "samples": stacks, "weights": weights,
+        }],
+        "name": name,
+        "exporter": "zitan-resto request profiler",
+    })
+
+
+def _collapsed(samples: list) -> str:
+    """Brendan Gregg's folded stacks, weighted in microseconds."""
+    totals: dict[str, float] = {}
+    for stack, weight in samples:
+        key = ";".join(f"{f[0]} ({f[1]}:{f[2]})" if f[1] else f[0] for f in stack) or "<idle>"
+        totals[key] = totals.get(key, 0) + weight
+    return "".join(f"{key} {round(seconds * 1e6)}\n" for key, seconds in totals.items())
+
+
+def _write(name: str, body: str):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    tmp = os.path.join(PROFILE_DIR, f".{name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(body)
+    os.replace(tmp, os.path.join(PROFILE_DIR, name))
+    saved = sorted((e for e in os.scandir(PROFILE_DIR) if e.is_file() and not e.name.startswith(".")),
+                   key=lambda e: e.stat().st_mtime)
+    for entry in saved[:-PROFILE_KEEP]:
+        os.remove(entry.path)
+
+
+class ProfilingMiddleware:
+    def __init__(self, app, authorize):
+        self.app = app
+        self.authorize = authorize  # token -> bool
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        fmt = token = None
+        for key, value in scope["headers"]:
+            if key == b"x-profile":
+                fmt = value.decode("latin-1").strip().lower()
+            elif key == b"authorization":
+                token = value.decode("latin-1")
+        if fmt is None:
+            return await self.app(scope, receive, send)
+        fmt = fmt if fmt in PROFILE_FORMATS else "speedscope"
+        if not (token and token.startswith("Bearer ") and self.authorize(token[7:])):
+            return await self.app(scope, receive, send)
+        if not _busy.acquire(blocking=False):
+            return await self.app(scope, receive, send)
+        try:
+            await self._profile(scope, receive, send, fmt)
+        finally:
+            _busy.release()
+
+    async def _profile(self, scope, receive, send, fmt: str):
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        slug = re.sub(r"[^\w]+", "_", scope["path"]).strip("_") or "root"
+        name = f"{stamp}-{scope['method'].lower()}-{slug[:60]}{PROFILE_FORMATS[fmt]}"
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []),
+                                      (b"x-profile-url", f"{PROFILE_URL}/{name}".encode())]
+            await send(message)
+
+        sampler = Sampler(asyncio.current_task(), asyncio.get_running_loop(), threading.get_ident(),
+                          ProfilingMiddleware._profile.__code__, PROFILE_INTERVAL_MS / 1000)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            title = f"{scope['method']} {scope['path']}"
+            body = _speedscope(sampler.samples, title) if fmt == "speedscope" else _collapsed(sampler.samples)
+            await asyncio.to_thread(_write, name, body)
@@ -0,0 +1,110 @@
+import time
+
+# In-process projection of the non-delivered orders, so the kitchen board
+# and dashboards read from memory instead of Supabase. Write paths in this
+# process apply their rows directly; a periodic reconcile against the
+# database picks up anything written elsewhere (other workers, SQL editor).
+# Each order also records the wall-clock time this projection saw it change
+# (delivered ones as tombstones for HISTORY_SECONDS), so the board's
+# since-cursor deltas are answered from memory too.
+HISTORY_SECONDS = 600
+
+
+class ActiveOrders:
+    def __init__(self, fields: list[str], history: float = HISTORY_SECONDS):
+        self.fields = fields
+        self.history = history
+        self.loaded = False
+        self.reconciled_at: float | None = None
+        self._by_id: dict[int, dict] = {}
+        self._by_status: dict[str, set[int]] = {}
+        self._touched: dict[int, float] = {}
+        self._changed_at: dict[int, float] = {}  # id -> time.time() of the last change seen
+        self._horizon = float("inf")  # changes before this may be missing from _changed_at
+        self._sorted: list[dict] | None = None
+
+    def _put(self, order: dict):
+        self._drop(order["id"])
+        self._by_id[order["id"]] = order
+        self._by_status.setdefault(order["status"], set()).add(order["id"])
+
+    def _drop(self, order_id: int):
+        old = self._by_id.pop(order_id, None)
+        if old is not None:
+            self._by_status.get(old["status"], set()).discard(order_id)
+
+    def _changed(self, order_id: int, now: float):
+        self._changed_at[order_id] = now
+        cutoff = now - self.history
+        if self._horizon < cutoff - 60:  # prune tombstones about once a minute
+            self._changed_at = {oid: at for oid, at in self._changed_at.items()
+                                if at >= cutoff or oid in self._by_id}
+            self._horizon = cutoff
+
+    def apply(self, row: dict):
+        """Upsert a freshly written order row, or drop it once delivered."""
+        order = {k: row.get(k) for k in self.fields}
+        self._touched[order["id"]] = time.monotonic()
+        self._changed(order["id"], time.time())
+        if order["status"] == "delivered":
+            self._drop(order["id"])
+        else:
+            self._put(order)
+        self._sorted = None
+
+    def replace(self, rows: list[dict], started: float):
+        """Reconcile with a database snapshot whose read began at `started`.
+
+        Orders applied locally after the read began are newer than the
+        snapshot, so they win over (or survive the absence from) it.
+        """
+        now = time.time()
+        fresh = {oid for oid, at in self._touched.items() if at >= started}
+        keep = {oid: self._by_id[oid] for oid in fresh if oid in self._by_id}
+        previous = self._by_id
+        self._by_id = {}
+        self._by_status.clear()
+        for row in rows:
+            if row["id"] not in fresh:
+                order = {k: row.get(k) for k in self.fields}
+                self._put(order)
+                if self.loaded and previous.get(order["id"]) != order:
+                    self._changed(order["id"], now)  # written elsewhere
+        for order in keep.values():
+            self._put(order)
+        if self.loaded:
+            for oid in previous.keys() - self._by_id.keys() - fresh:
+                self._changed(oid, now)  # delivered (or deleted) elsewhere
+        else:
+            self._horizon = now
+        self._touched = {oid: at for oid, at in self._touched.items() if at >= started}
+        self._sorted = None
+        self.loaded = True
+        self.reconciled_at = now
+
+    def orders(self) -> list[dict]:
+        """Active orders, oldest first (same order as get_active_orders)."""
+        if self._sorted is None:
+            self._sorted = sorted(self._by_id.values(), key=lambda o: (o["created_at"] or "", o["id"]))
+        return self._sorted
+
+    def changes_since(self, since: float) -> tuple[list[dict], list[int]] | None:
+        """Active orders and removed ids changed at or after `since` (epoch
+        seconds), or None if the recorded history doesn't reach back that far."""
+        if not self.loaded or since < self._horizon:
+            return None
+        changed = [o for o in self.orders() if self._changed_at.get(o["id"], 0) >= since]
+        removed = [oid for oid, at in self._changed_at.items() if at >= since and oid not in self._by_id]
+        return changed, removed
+
+    def by_status(self, status: str) -> list[dict]:
+        ids = self._by_status.get(status, ())
+        return [o for o in self.orders() if o["id"] in ids]
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "reconciled_at": self.reconciled_at,
+            "count": len(self._by_id),
+            "by_status": {s: len(ids) for s, ids in self._by_status.items() if ids},
+        }
@@ -0,0 +1,125 @@
+import os
+
+# Persistence behind the service layer. STORAGE_BACKEND picks the engine:
+# "supabase" (PostgREST + Storage, the default) or "sqlite" (one local WAL
+# file plus a directory of uploaded images, for single-venue installs and
+# offline benchmarks). Both return plain dict rows shaped like Supabase's.
+
+
+class Rejected(Exception):
+    """The database refused a write (constraint, bad value); retrying won't help."""
+
+
+class Repository:
+    """Storage interface for menu, categories, settings, orders and images.
+
+    `fields` arguments are comma-separated column lists ("*" for all).
+    Single-row lookups return None when nothing matches.
+    """
+
+    name = "base"
+
+    # --- Menu ---
+    async def list_menu_items(self, fields: str, available_only: bool = False) -> list:
+        raise NotImplementedError
+
+    async def insert_menu_item(self, row: dict) -> dict | None:
+        raise NotImplementedError
+
+    async def update_menu_item(self, item_id: str, fields: dict) -> dict | None:
+        raise NotImplementedError
+
+    async def delete_menu_item(self, item_id: str) -> bool:
+        raise NotImplementedError
+
+    # --- Categories ---
+    async def list_categories(self, fields: str) -> list:
+        raise NotImplementedError
+
+    async def insert_category(self, row: dict) -> dict | None:
+        raise NotImplementedError
+
+    async def update_category(self, cat_id: str, fields: dict) -> dict | None:
+        raise NotImplementedError
+
+    async def delete_category(self, cat_id: str) -> bool:
+        raise NotImplementedError
+
+    # --- Settings (single row) ---
+    async def get_settings(self) -> dict | None:
+        raise NotImplementedError
+
+    async def update_settings(self, fields: dict) -> dict | None:
+        raise NotImplementedError
+
+    # --- Orders ---
+    async def insert_order(self, row: dict) -> dict:
+        raise NotImplementedError
+
+    async def insert_orders_once(self, rows: list) -> list:
+        """Insert rows, skipping (but returning) any whose tracking_token exists."""
+        raise NotImplementedError
+
+    async def get_order(self, order_id: int, fields: str = "*") -> dict | None:
+        raise NotImplementedError
+
+    async def get_order_by_token(self, token: str, fields: str) -> dict | None:
+        raise NotImplementedError
+
+    async def list_active_orders(self, fields: str) -> list:
+        raise NotImplementedError
+
+    async def orders_updated_since(self, since: str, fields: str) -> list:
+        """Orders with updated_at >= since, by (updated_at, id)."""
+        raise NotImplementedError
+
+    async def update_order(self, order_id: int, fields: dict, expected_status: str = None) -> dict | None:
+        """Apply `fields`; with expected_status, only while the status still matches."""
+        raise NotImplementedError
+
+    async def orders_between(self, start: str, end: str, fields: str, newest_first: bool = False) -> list:
+        """Orders with start <= created_at < end (UTC ISO bounds)."""
+        raise NotImplementedError
+
+    async def first_order_created_at(self) -> str | None:
+        raise NotImplementedError
+
+    async def order_page(self, fields: str, start: str = None, end: str = None,
+                         after: tuple = None, limit: int = 500) -> list:
+        """Up to `limit` orders by (created_at, id), strictly after the `after` key."""
+        raise NotImplementedError
+
+    # --- Daily sales rollups ---
+    async def latest_rollup_day(self) -> str | None:
+        raise NotImplementedError
+
+    async def upsert_daily_sales(self, row: dict):
+        raise NotImplementedError
+
+    async def daily_sales_between(self, date_from: str, date_to: str) -> list:
+        raise NotImplementedError
+
+    # --- Images ---
+    async def upload_image(self, path: str, data: bytes, content_type: str,
+                           cache_control: str = None) -> str:
+        """Store a file and return its public URL."""
+        raise NotImplementedError
+
+    # --- Lifecycle ---
+    async def aclose(self):
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": self.name}
+
+
+def make_repository() -> Repository:
+    """Build the configured backend (imported lazily: each has its own deps)."""
+    backend = os.getenv("STORAGE_BACKEND", "supabase")
+    if backend == "sqlite":
+        from backend.services.sqlite_repo import SQLiteRepository
+        return SQLiteRepository()
+    if backend == "supabase":
+        from backend.services.supabase_repo import SupabaseRepository
+        return SupabaseRepository()
+    raise RuntimeError(f"Unknown STORAGE_BACKEND {backend!r} (use supabase or sqlite)")
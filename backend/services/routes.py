@@ -0,0 +1,20 @@
+# Route template lookup for middleware that labels requests by route
+# ("/api/orders/{order_id:int}") rather than by raw path.
+
+_templates: dict = {}
+
+
+def route_template(scope) -> str:
+    """Template of the route that handled `scope` (call after routing)."""
+    endpoint = scope.get("endpoint")
+    if endpoint is not None:
+        if not _templates and "app" in scope:
+            for route in scope["app"].routes:
+                if getattr(route, "endpoint", None) is not None:
+                    _templates[route.endpoint] = route.path
+        template = _templates.get(endpoint)
+        if template:
+            return template
+    if scope.get("root_path"):
+        return scope["root_path"] + "/{path}"  # mounted static apps
+    return "<unmatched>"
@@ -0,0 +1,435 @@
+import os
+import json
+import uuid
+import sqlite3
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from backend.services.repository import Repository, Rejected
+from backend.services.tracing import query_span
+
+# Embedded single-file backend: the same tables as schema.sql in one SQLite
+# database (WAL mode), with uploaded images written under static/uploads.
+# All statements run on one dedicated thread, which owns the connection, so
+# queries never block the event loop and never contend with each other.
+SQLITE_PATH = os.path.join("data", "restaurant.db")
+UPLOAD_DIR = os.path.join("static", "uploads")
+UPLOAD_URL = "/static/uploads"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    id             INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_number   INTEGER NOT NULL,
+    unit_number    TEXT NOT NULL,
+    phone_number   TEXT,
+    email          TEXT,
+    delivery_notes TEXT,
+    cutlery        INTEGER NOT NULL DEFAULT 0,
+    order_type     TEXT NOT NULL DEFAULT 'delivery',
+    payment_method TEXT NOT NULL DEFAULT 'cash',
+    gcash_ref      TEXT,
+    items          TEXT NOT NULL DEFAULT '[]',
+    total          REAL NOT NULL DEFAULT 0,
+    tracking_token TEXT NOT NULL UNIQUE,
+    status         TEXT NOT NULL DEFAULT 'new'
+                   CHECK (status IN ('new', 'preparing', 'ready', 'delivered')),
+    created_at     TEXT NOT NULL,
+    updated_at     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_orders_status ON orders (status) WHERE status != 'delivered';
+CREATE INDEX IF NOT EXISTS idx_orders_created_at_id ON orders (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_orders_updated_at ON orders (updated_at);
+
+CREATE TABLE IF NOT EXISTS menu_items (
+    id             TEXT PRIMARY KEY,
+    name           TEXT NOT NULL,
+    description    TEXT,
+    price          REAL NOT NULL CHECK (price >= 0),
+    category       TEXT NOT NULL,
+    image_url      TEXT,
+    image_variants TEXT,
+    is_available   INTEGER NOT NULL DEFAULT 1,
+    created_at     TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS categories (
+    id           TEXT PRIMARY KEY,
+    name         TEXT NOT NULL UNIQUE,
+    display_name TEXT NOT NULL,
+    emoji        TEXT DEFAULT '',
+    sort_order   INTEGER DEFAULT 0,
+    created_at   TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS restaurant_settings (
+    id                INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    accepting_orders  INTEGER NOT NULL DEFAULT 1,
+    prep_time_minutes INTEGER NOT NULL DEFAULT 25 CHECK (prep_time_minutes BETWEEN 5 AND 120),
+    updated_at        TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS daily_sales (
+    day         TEXT PRIMARY KEY,
+    order_count INTEGER NOT NULL DEFAULT 0,
+    revenue     REAL NOT NULL DEFAULT 0,
+    items       TEXT NOT NULL DEFAULT '{}',
+    payments    TEXT NOT NULL DEFAULT '{}',
+    updated_at  TEXT NOT NULL
+);
+"""
+
+_SEED_CATEGORIES = (("mains", "Mains", "🍛", 1), ("sides", "Sides", "🥗", 2), ("drinks", "Drinks", "🥤", 3))
+
+# Columns stored as JSON text / 0-1 integers, decoded back on read
+_JSON = {"items", "image_variants", "payments"}
+_BOOL = {"cutlery", "is_available", "accepting_orders"}
+_STAMPED = {"orders", "restaurant_settings", "daily_sales"}  # have updated_at
+
+
+def _now() -> str:
+    return _stamp(datetime.now(timezone.utc))
+
+
+def _stamp(ts: datetime) -> str:
+    # Fixed width (always microseconds, always +00:00) so text order is time order
+    return ts.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")
+
+
+def _ts(value: str) -> str:
+    return _stamp(datetime.fromisoformat(value))
+
+
+def _describe(fn, args) -> tuple[str, str, str]:
+    """(table, op, filter shape) of a statement helper call, for tracing."""
+    op = fn.__name__.strip("_")
+    if op == "insert_once":
+        return "orders", op, "on conflict tracking_token"
+    if op == "upsert_day":
+        return "daily_sales", op, "on conflict day"
+    table = args[0] if args and isinstance(args[0], str) else "-"
+    if op == "select":
+        shape = " ".join(a for a in (args[2:3] + args[4:5]) if a)
+    elif op == "update":
+        shape = args[2]
+    elif op == "delete":
+        shape = args[1]
+    else:
+        shape = ""
+    return table, op, shape
+
+
+class SQLiteRepository(Repository):
+    name = "sqlite"
+
+    def __init__(self, path: str = None, upload_dir: str = UPLOAD_DIR):
+        self.path = path or os.getenv("SQLITE_PATH", SQLITE_PATH)
+        self.upload_dir = upload_dir
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self._db = None
+        self._columns: dict[str, list[str]] = {}
+
+    # --- Plumbing ---
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("PRAGMA busy_timeout=5000")  # other workers may hold the write lock
+            db.executescript(_SCHEMA)
+            now = _now()
+            db.execute("INSERT OR IGNORE INTO restaurant_settings (id, updated_at) VALUES (1, ?)", (now,))
+            if not db.execute("SELECT 1 FROM categories LIMIT 1").fetchone():
+                db.executemany(
+                    "INSERT OR IGNORE INTO categories (id, name, display_name, emoji, sort_order, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    [(str(uuid.uuid4()), *cat, now) for cat in _SEED_CATEGORIES],
+                )
+            for table in ("orders", "menu_items", "categories", "restaurant_settings", "daily_sales"):
+                self._columns[table] = [r[1] for r in db.execute(f"PRAGMA table_info({table})")]
+            self._db = db
+        return self._db
+
+    async def _run(self, fn, *args):
+        # Timed from the loop, so the span includes waiting for the thread
+        loop = asyncio.get_running_loop()
+        with query_span("sqlite", *_describe(fn, args)):
+            return await loop.run_in_executor(self._executor, fn, *args)
+
+    def _cols(self, table: str, fields: str) -> str:
+        if fields.strip() == "*":
+            return "*"
+        names = [f.strip() for f in fields.split(",")]
+        unknown = set(names) - set(self._columns[table])
+        if unknown:
+            raise ValueError(f"unknown {table} columns: {sorted(unknown)}")
+        return ",".join(names)
+
+    @staticmethod
+    def _decode(cursor) -> list[dict]:
+        names = [d[0] for d in cursor.description]
+        rows = []
+        for values in cursor.fetchall():
+            row = dict(zip(names, values))
+            for name in names:
+                value = row[name]
+                if name in _JSON and isinstance(value, str):
+                    row[name] = json.loads(value)
+                elif name in _BOOL and value is not None:
+                    row[name] = bool(value)
+            rows.append(row)
+        return rows
+
+    @staticmethod
+    def _encode(values: dict) -> dict:
+        out = {}
+        for name, value in values.items():
+            if name in _JSON and value is not None:
+                value = json.dumps(value, ensure_ascii=False)
+            elif name in _BOOL and value is not None:
+                value = int(bool(value))
+            elif name in ("created_at", "updated_at") and value:
+                value = _ts(value)
+            out[name] = value
+        return out
+
+    def _select(self, table: str, fields: str, where: str = "", params=(), tail: str = "") -> list[dict]:
+        db = self._conn()
+        sql = f"SELECT {self._cols(table, fields)} FROM {table}"
+        if where:
+            sql += f" WHERE {where}"
+        return self._decode(db.execute(f"{sql} {tail}", params))
+
+    def _insert(self, table: str, row: dict, on_conflict: str | None = None) -> dict | None:
+        db = self._conn()
+        values = self._encode(row)
+        columns = self._columns[table]
+        if "created_at" in columns:
+            values.setdefault("created_at", _now())
+        if "updated_at" in columns:
+            values.setdefault("updated_at", values.get("created_at") or _now())
+        if table in ("menu_items", "categories"):
+            values.setdefault("id", str(uuid.uuid4()))
+        names = ",".join(values)
+        marks = ",".join("?" * len(values))
+        # Only a conflict on the named key is skipped; NOT NULL, CHECK and
+        # other unique violations still raise (OR IGNORE would swallow them)
+        skip = f" ON CONFLICT({on_conflict}) DO NOTHING" if on_conflict else ""
+        try:
+            rows = self._decode(db.execute(
+                f"INSERT INTO {table} ({names}) VALUES ({marks}){skip} RETURNING *", list(values.values())))
+        except sqlite3.IntegrityError as exc:
+            raise Rejected(str(exc)) from exc
+        return rows[0] if rows else None
+
+    def _update(self, table: str, fields: dict, where: str, params=()) -> list[dict]:
+        values = self._encode(fields)
+        if table in _STAMPED:
+            values["updated_at"] = _now()
+        assignments = ",".join(f"{name} = ?" for name in values)
+        try:
+            return self._decode(self._conn().execute(
+                f"UPDATE {table} SET {assignments} WHERE {where} RETURNING *",
+                [*values.values(), *params]))
+        except sqlite3.IntegrityError as exc:
+            raise Rejected(str(exc)) from exc
+
+    def _delete(self, table: str, where: str, params=()) -> bool:
+        return self._conn().execute(f"DELETE FROM {table} WHERE {where}", params).rowcount > 0
+
+    # --- Menu ---
+
+    async def list_menu_items(self, fields, available_only=False):
+        where = "is_available = 1" if available_only else ""
+        return await self._run(self._select, "menu_items", fields, where, (), "ORDER BY created_at")
+
+    async def insert_menu_item(self, row):
+        return await self._run(self._insert, "menu_items", row)
+
+    async def update_menu_item(self, item_id, fields):
+        rows = await self._run(self._update, "menu_items", fields, "id = ?", (item_id,))
+        return rows[0] if rows else None
+
+    async def delete_menu_item(self, item_id):
+        return await self._run(self._delete, "menu_items", "id = ?", (item_id,))
+
+    # --- Categories ---
+
+    async def list_categories(self, fields):
+        return await self._run(self._select, "categories", fields, "", (), "ORDER BY sort_order")
+
+    async def insert_category(self, row):
+        return await self._run(self._insert, "categories", row)
+
+    async def update_category(self, cat_id, fields):
+        rows = await self._run(self._update, "categories", fields, "id = ?", (cat_id,))
+        return rows[0] if rows else None
+
+    async def delete_category(self, cat_id):
+        return await self._run(self._delete, "categories", "id = ?", (cat_id,))
+
+    # --- Settings ---
+
+    async def get_settings(self):
+        rows = await self._run(self._select, "restaurant_settings", "*", "id = 1")
+        return rows[0] if rows else None
+
+    async def update_settings(self, fields):
+        rows = await self._run(self._update, "restaurant_settings", fields, "id = 1")
+        return rows[0] if rows else None
+
+    # --- Orders ---
+
+    async def insert_order(self, row):
+        return await self._run(self._insert, "orders", row)
+
+    def _insert_once(self, rows: list) -> list:
+        db = self._conn()
+        out = []
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            for row in rows:
+                inserted = self._insert("orders", row, on_conflict="tracking_token")
+                if inserted is None:
+                    existing = self._select("orders", "*", "tracking_token = ?", (row["tracking_token"],))
+                    if not existing:
+                        raise Rejected(f"order {row['tracking_token']!r} was neither inserted nor found")
+                    inserted = existing[0]
+                out.append(inserted)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return out
+
+    async def insert_orders_once(self, rows):
+        return await self._run(self._insert_once, rows)
+
+    async def get_order(self, order_id, fields="*"):
+        rows = await self._run(self._select, "orders", fields, "id = ?", (order_id,))
+        return rows[0] if rows else None
+
+    async def get_order_by_token(self, token, fields):
+        rows = await self._run(self._select, "orders", fields, "tracking_token = ?", (token,))
+        return rows[0] if rows else None
+
+    async def list_active_orders(self, fields):
+        # "+created_at" keeps the planner on the partial status index (a
+        # handful of open orders, then sorted) instead of walking the whole
+        # table in created_at order through idx_orders_created_at_id
+        return await self._run(self._select, "orders", fields, "status != 'delivered'", (),
+                               "ORDER BY +created_at")
+
+    async def orders_updated_since(self, since, fields):
+        return await self._run(self._select, "orders", fields, "updated_at >= ?", (_ts(since),),
+                               "ORDER BY updated_at, id")
+
+    async def update_order(self, order_id, fields, expected_status=None):
+        where, params = "id = ?", [order_id]
+        if expected_status is not None:
+            where += " AND status = ?"
+            params.append(expected_status)
+        rows = await self._run(self._update, "orders", fields, where, params)
+        return rows[0] if rows else None
+
+    async def orders_between(self, start, end, fields, newest_first=False):
+        return await self._run(self._select, "orders", fields, "created_at >= ? AND created_at < ?",
+                               (_ts(start), _ts(end)),
+                               "ORDER BY created_at DESC" if newest_first else "ORDER BY created_at")
+
+    async def first_order_created_at(self):
+        rows = await self._run(self._select, "orders", "created_at", "", (), "ORDER BY created_at LIMIT 1")
+        return rows[0]["created_at"] if rows else None
+
+    async def order_page(self, fields, start=None, end=None, after=None, limit=500):
+        clauses, params = [], []
+        if start:
+            clauses.append("created_at >= ?")
+            params.append(_ts(start))
+        if end:
+            clauses.append("created_at < ?")
+            params.append(_ts(end))
+        if after:
+            clauses.append("(created_at, id) > (?, ?)")
+            params += [_ts(after[0]), after[1]]
+        return await self._run(self._select, "orders", fields, " AND ".join(clauses), params,
+                               f"ORDER BY created_at, id LIMIT {int(limit)}")
+
+    # --- Daily sales ---
+
+    async def latest_rollup_day(self):
+        rows = await self._run(self._select, "daily_sales", "day", "", (), "ORDER BY day DESC LIMIT 1")
+        return rows[0]["day"] if rows else None
+
+    def _upsert_day(self, row: dict):
+        values = {**self._encode(row), "updated_at": _now()}
+        names = ",".join(values)
+        marks = ",".join("?" * len(values))
+        updates = ",".join(f"{n} = excluded.{n}" for n in values if n != "day")
+        self._conn().execute(
+            f"INSERT INTO daily_sales ({names}) VALUES ({marks}) ON CONFLICT (day) DO UPDATE SET {updates}",
+            list(values.values()))
+
+    async def upsert_daily_sales(self, row):
+        await self._run(self._upsert_day, row)
+
+    async def daily_sales_between(self, date_from, date_to):
+        return await self._run(self._select, "daily_sales", "day,order_count,revenue,items,payments",
+                               "day >= ? AND day <= ?", (date_from, date_to), "ORDER BY day")
+
+    # --- Bulk load (seeding, imports) ---
+
+    def _bulk_insert(self, table: str, rows: list):
+        db = self._conn()
+        for i, row in enumerate(rows):
+            values = self._encode(row)
+            if table in ("menu_items", "categories"):
+                values.setdefault("id", str(uuid.uuid4()))
+            if "updated_at" in self._columns[table]:
+                values.setdefault("updated_at", values.get("created_at") or _now())
+            rows[i] = values
+        names = list(rows[0])
+        db.execute("BEGIN")
+        try:
+            db.executemany(
+                f"INSERT INTO {table} ({','.join(names)}) VALUES ({','.join('?' * len(names))})",
+                [[r.get(n) for n in names] for r in rows])
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    async def bulk_insert(self, table: str, rows: list):
+        """Insert many same-shaped rows in one transaction (no RETURNING)."""
+        if rows:
+            await self._run(self._bulk_insert, table, list(rows))
+
+    # --- Images ---
+
+    def _write_file(self, path: str, data: bytes):
+        target = os.path.join(self.upload_dir, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp = f"{target}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, target)
+
+    async def upload_image(self, path, data, content_type, cache_control=None):
+        with query_span("sqlite", "uploads", "upload"):
+            await asyncio.to_thread(self._write_file, path, data)
+        return f"{UPLOAD_URL}/{path}"
+
+    # --- Lifecycle ---
+
+    def _close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    async def aclose(self):
+        await self._run(self._close)
+
+    def stats(self):
+        return {"backend": self.name, "path": self.path}
@@ -1,42 +1,96 @@
 import os
+import hmac
+import time
 import uuid
+import base64
+import hashlib
 import secrets
 import random
-from datetime import datetime, timezone
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
-from supabase import create_client
+from backend.services.cache import cached, invalidate
+from backend.services.metrics import timed
+from backend.services.events import order_events
+from backend.services.projection import ActiveOrders
+from backend.services.journal import OrderJournal
+from backend.services.repository import Rejected, make_repository
+from backend.services.analytics import DailyAnalytics, BUSINESS_TZ, business_date, combine_rollups
 
 load_dotenv()
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_ROLE") or os.getenv("SUPABASE_SERVICE_KEY")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "admin")
-
-if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
-    raise RuntimeError("Supabase env vars missing")
-
-supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+ORDERS_RECONCILE_SECONDS = float(os.getenv("ORDERS_RECONCILE_SECONDS", "15"))
+ANALYTICS_RESEED_SECONDS = float(os.getenv("ANALYTICS_RESEED_SECONDS", "300"))
+ROLLUP_INTERVAL_SECONDS = float(os.getenv("ROLLUP_INTERVAL_SECONDS", "3600"))
+EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", "500"))
+# "journal": checkout writes to the local order journal and returns; a
+# background worker flushes to the database. "direct": insert inline.
+ORDER_INTAKE = os.getenv("ORDER_INTAKE", "direct")
+JOURNAL_BATCH_SIZE = int(os.getenv("JOURNAL_BATCH_SIZE", "50"))
+JOURNAL_FLUSH_SECONDS = float(os.getenv("JOURNAL_FLUSH_SECONDS", "1"))
+JOURNAL_MAX_BACKOFF = 60.0
+ADMIN_TOKEN_TTL = int(os.getenv("ADMIN_TOKEN_TTL_SECONDS", str(12 * 3600)))
+
+# Storage backend chosen by STORAGE_BACKEND (Supabase or local SQLite)
+repo = make_repository()
 
 # Valid status transitions (one direction only per CLAUDE.md)
 STATUS_FLOW = ["new", "preparing", "ready", "delivered"]
 
-# In-memory token store (server restart invalidates all sessions)
-_admin_tokens: set[str] = set()
-
+# Admin tokens are stateless HMAC-signed expiry stamps, valid on any worker.
+# Without ADMIN_TOKEN_SECRET the key is derived from the password and a
+# server secret, so every process agrees and changing the password logs
+# out. The secret is the service key, or -- with no service key (SQLite
+# backend) -- a random one generated once in ADMIN_TOKEN_SECRET_PATH: a key
+# from the password alone would let one token be brute-forced offline.
+ADMIN_TOKEN_SECRET_PATH = os.getenv("ADMIN_TOKEN_SECRET_PATH", os.path.join("data", "admin_token.key"))
 
-def get_menu_items():
-    res = (
-        supabase
-        .table("menu_items")
-        .select("id,name,description,price,category,image_url")
-        .eq("is_available", True)
-        .order("created_at")
-        .execute()
-    )
-    return res.data
 
-
-def create_order(unit_number: str, items: list, total: float,
+def _local_token_secret(path: str = ADMIN_TOKEN_SECRET_PATH) -> bytes:
+    """Read the persisted random secret, creating it on first use."""
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        pass  # another worker (or an earlier run) made it
+    else:
+        with os.fdopen(fd, "w") as f:
+            f.write(secrets.token_hex(32))
+    for _ in range(50):
+        with open(path) as f:
+            secret = f.read().strip()
+        if secret:
+            return secret.encode()
+        time.sleep(0.01)  # created by a worker that hasn't written it yet
+    raise RuntimeError(f"admin token secret {path} is empty")
+
+
+_TOKEN_KEY = (
+    os.getenv("ADMIN_TOKEN_SECRET", "").encode()
+    or hmac.new(SUPABASE_SERVICE_KEY.encode() if SUPABASE_SERVICE_KEY else _local_token_secret(),
+                ADMIN_PASSWORD.encode(), hashlib.sha256).digest()
+)
+
+# Cache keys for the read-mostly catalog tables
+MENU_KEY = "menu_items:available"
+MENU_ALL_KEY = "menu_items:all"
+CATEGORIES_KEY = "categories"
+SETTINGS_KEY = "restaurant_settings"
+
+
+@timed
+@cached(MENU_KEY)
+async def get_menu_items():
+    return await repo.list_menu_items(
+        "id,name,description,price,category,image_url,image_variants", available_only=True)
+
+
+@timed
+async def create_order(unit_number: str, items: list, total: float,
                  phone_number: str = None, email: str = None,
                  delivery_notes: str = None,
                  cutlery: bool = False, order_type: str = "delivery",
@@ -58,77 +112,287 @@ def create_order(unit_number: str, items: list, total: float,
         "status": "new",
         "tracking_token": tracking_token,
     }
-    res = supabase.table("orders").insert(row).execute()
-    return res.data[0]
+    if ORDER_INTAKE == "journal":
+        # Stamp intake time now; the insert may land seconds later
+        row["created_at"] = datetime.now(timezone.utc).isoformat()
+        await order_journal.append(row)
+        _journal_wakeup.set()
+        return {"id": None, **row}
+    order = await repo.insert_order(row)
+    _order_changed("created", order)
+    return order
 
 
-def get_order(order_id: int):
-    res = (
-        supabase
-        .table("orders")
-        .select("*")
-        .eq("id", order_id)
-        .single()
-        .execute()
-    )
-    return res.data
+# ========================================
+# Write-behind order journal
+# ========================================
+
+order_journal = OrderJournal()
+_journal_wakeup = asyncio.Event()
+
+
+async def _reject_journaled(seq: int, row: dict, exc: Rejected):
+    log.warning("order %s rejected by the database: %s", row["tracking_token"], exc)
+    await order_journal.reject([seq], repr(exc))
+
+
+@timed
+async def flush_order_journal() -> int:
+    """Drain the journal into the database in batches; returns rows flushed.
+
+    If the database rejects a batch, it is retried row by row so one bad
+    order can't hold back the rest; rejected rows are moved to the
+    journal's dead-letter table (never dropped) with the error noted.
+    Transport errors propagate for backoff.
+    """
+    flushed = 0
+    while True:
+        batch = await order_journal.batch(JOURNAL_BATCH_SIZE)
+        if not batch:
+            return flushed
+        try:
+            # Idempotent on tracking_token: a retry after a lost response
+            # must not duplicate orders
+            rows = await repo.insert_orders_once([row for _, row in batch])
+            done = [seq for seq, _ in batch]
+        except Rejected as exc:
+            rows, done = [], []
+            if len(batch) == 1:
+                await _reject_journaled(*batch[0], exc)
+            else:
+                for seq, row in batch:
+                    try:
+                        rows += await repo.insert_orders_once([row])
+                        done.append(seq)
+                    except Rejected as row_exc:
+                        await _reject_journaled(seq, row, row_exc)
+        for row in sorted(rows, key=lambda r: r["id"]):
+            _order_changed("created", row)
+        if done:
+            await order_journal.remove(done)
+            flushed += len(done)
+        if len(batch) < JOURNAL_BATCH_SIZE:
+            return flushed
+
+
+async def run_order_flusher():
+    """Background task: replay the journal at startup, then flush on demand."""
+    backoff = JOURNAL_FLUSH_SECONDS
+    while True:
+        _journal_wakeup.clear()
+        try:
+            await flush_order_journal()
+            backoff = JOURNAL_FLUSH_SECONDS
+        except Exception:
+            log.warning("order journal flush failed", exc_info=True)
+            backoff = min(backoff * 2, JOURNAL_MAX_BACKOFF)
+            # Jittered, and new orders don't cut it short, so a recovering
+            # database isn't hit by every worker at once
+            await asyncio.sleep(random.uniform(backoff / 2, backoff))
+            continue
+        try:
+            await asyncio.wait_for(_journal_wakeup.wait(), JOURNAL_FLUSH_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+@timed
+async def get_order(order_id: int):
+    return await repo.get_order(order_id)
 
 
 # Tenant-safe fields (no internal IDs or tokens)
 _TENANT_ORDER_FIELDS = "order_number,unit_number,items,total,status,order_type,payment_method,created_at,updated_at,tracking_token"
 
 
-def get_order_by_token(token: str):
-    """Look up an order by its tracking token. Returns tenant-safe fields only."""
+def tenant_view(order: dict):
+    """Strip a full order row down to the tenant-safe fields."""
+    return {k: order.get(k) for k in _TENANT_ORDER_FIELDS.split(",")}
+
+
+@timed
+async def get_order_by_token(token: str):
+    """Look up an order by its tracking token. Returns tenant-safe fields only.
+
+    None means no such order; a failed lookup (database down, circuit
+    open) raises, so callers can tell the two apart.
+    """
     try:
-        res = (
-            supabase
-            .table("orders")
-            .select(_TENANT_ORDER_FIELDS)
-            .eq("tracking_token", token)
-            .single()
-            .execute()
-        )
-        return res.data
-    except Exception:
-        return None
+        uuid.UUID(token)
+    except ValueError:
+        return None  # not a token we could have issued
+    if ORDER_INTAKE == "journal":
+        pending = await order_journal.get(token)
+        if pending is not None:
+            return tenant_view({**pending, "updated_at": pending["created_at"]})
+    return await repo.get_order_by_token(token, _TENANT_ORDER_FIELDS)
 
 
-def get_active_orders():
-    res = (
-        supabase
-        .table("orders")
-        .select("id,order_number,unit_number,phone_number,delivery_notes,cutlery,order_type,payment_method,gcash_ref,items,total,status,created_at,updated_at")
-        .neq("status", "delivered")
-        .order("created_at", desc=False)
-        .execute()
-    )
-    return res.data
+_ACTIVE_ORDER_FIELDS = "id,order_number,unit_number,phone_number,delivery_notes,cutlery,order_type,payment_method,gcash_ref,items,total,status,created_at,updated_at"
 
 
-def advance_order_status(order_id: int):
-    """Move order to the next status in the lifecycle."""
-    order = get_order(order_id)
-    if not order:
-        return None
+def board_view(order: dict):
+    """Strip a full order row down to the kitchen-board fields of GET /api/orders."""
+    return {k: order.get(k) for k in _ACTIVE_ORDER_FIELDS.split(",")}
+
+# updated_at is stamped at transaction start, so a slow commit can land just
+# behind a cursor; re-send this window on every delta (client merge is idempotent)
+CHANGES_OVERLAP = timedelta(seconds=2)
+PROJECTED_CHANGES_OVERLAP = CHANGES_OVERLAP.total_seconds() + ORDERS_RECONCILE_SECONDS
+
+
+active_orders = ActiveOrders(_ACTIVE_ORDER_FIELDS.split(","))
+log = logging.getLogger(__name__)
+
+
+daily_analytics = DailyAnalytics()
+
+
+def _order_changed(event: str, row: dict):
+    """Fan a written order row out to the projection, analytics and SSE bus."""
+    active_orders.apply(row)
+    daily_analytics.apply(row)
+    order_events.publish(event, row)
 
-    current = order["status"]
-    idx = STATUS_FLOW.index(current)
+
+@timed
+async def get_active_orders():
+    return await repo.list_active_orders(_ACTIVE_ORDER_FIELDS)
+
+
+@timed
+async def reconcile_active_orders():
+    """Reload the active-orders projection from the database."""
+    started = time.monotonic()
+    rows = await get_active_orders()
+    active_orders.replace(rows, started)
+
+
+async def run_active_orders_reconciler():
+    """Background task: keep the projection in line with the database."""
+    while True:
+        try:
+            await reconcile_active_orders()
+        except Exception:
+            log.warning("active orders reconcile failed", exc_info=True)
+        try:
+            await refresh_daily_analytics()
+        except Exception:
+            log.warning("daily analytics reseed failed", exc_info=True)
+        await asyncio.sleep(ORDERS_RECONCILE_SECONDS)
+
+
+@timed
+async def list_active_orders():
+    """Active orders from memory once the projection is loaded."""
+    if active_orders.loaded:
+        return active_orders.orders()
+    return await get_active_orders()
+
+
+def _parse_cursor(since: str):
+    try:
+        ts = datetime.fromisoformat(since.replace(" ", "+"))
+    except (TypeError, ValueError):
+        return None
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def _next_cursor(rows: list, since: datetime = None):
+    stamps = [datetime.fromisoformat(r["updated_at"]) for r in rows if r.get("updated_at")]
+    if since:
+        stamps.append(since)
+    latest = max(stamps) if stamps else datetime.now(timezone.utc)
+    return latest.isoformat()
+
+
+def _projected_changes(cursor: datetime | None):
+    """get_order_changes() answered from the active-orders projection.
+
+    The cursor is the time the projection was read. Changes made on other
+    workers are only seen here at the next reconcile, so the overlap
+    covers a reconcile interval: a cursor issued by any worker then still
+    catches them. Cursors older than the projection's history get a
+    snapshot.
+    """
+    now = time.time()
+    delta = None
+    if cursor is not None:
+        delta = active_orders.changes_since(cursor.timestamp() - PROJECTED_CHANGES_OVERLAP)
+    next_cursor = datetime.fromtimestamp(now, timezone.utc).isoformat()
+    if delta is None:
+        return {"full": True, "orders": active_orders.orders(), "removed": [], "cursor": next_cursor}
+    changed, removed = delta
+    return {"full": False, "orders": changed, "removed": removed, "cursor": next_cursor}
+
+
+@timed
+async def get_order_changes(since: str = None):
+    """Active-orders feed as a delta against a timestamp cursor.
+
+    Without a usable cursor this is a full snapshot. Otherwise only orders
+    touched since the cursor are returned: active ones in `orders`, and the
+    ids of those that left the active set (delivered) in `removed`. Served
+    from memory once the projection is loaded.
+    """
+    cursor = _parse_cursor(since) if since else None
+    if active_orders.loaded:
+        return _projected_changes(cursor)
+    if cursor is None:
+        rows = await get_active_orders()
+        return {"full": True, "orders": rows, "removed": [], "cursor": _next_cursor(rows)}
+
+    rows = await repo.orders_updated_since((cursor - CHANGES_OVERLAP).isoformat(), _ACTIVE_ORDER_FIELDS)
+    changed = [r for r in rows if r["status"] != "delivered"]
+    removed = [r["id"] for r in rows if r["status"] == "delivered"]
+    return {"full": False, "orders": changed, "removed": removed,
+            "cursor": _next_cursor(rows, cursor)}
+
+
+class StatusConflict(Exception):
+    """Raised when an order is no longer in the status the caller expected."""
+
+    def __init__(self, order: dict):
+        super().__init__(f"order {order.get('id')} is now {order.get('status')}")
+        self.order = order
+
+
+@timed
+async def advance_order_status(order_id: int, expected: str = None):
+    """Move order to the next status in the lifecycle.
+
+    Compare-and-set: the update only applies while the order is still in
+    `expected`, so two taps on the same card can't both advance it. Callers
+    that pass the status they displayed get a single round trip; without it
+    the current status is read first. Raises StatusConflict if another
+    writer got there first.
+    """
+    if expected is None:
+        order = await get_order(order_id)
+        if not order:
+            return None
+        expected = order["status"]
+
+    idx = STATUS_FLOW.index(expected)
     if idx >= len(STATUS_FLOW) - 1:
-        return order  # already delivered
+        return await get_order(order_id)  # already delivered
 
     new_status = STATUS_FLOW[idx + 1]
-    res = (
-        supabase
-        .table("orders")
-        .update({"status": new_status})
-        .eq("id", order_id)
-        .execute()
-    )
-    return res.data[0]
+    order = await repo.update_order(order_id, {"status": new_status}, expected_status=expected)
+    if order:
+        _order_changed("advanced", order)
+        return order
+
+    # No row matched: either the order doesn't exist or its status moved on.
+    # A failed read raises rather than passing for a missing order
+    current = await get_order(order_id)
+    if not current:
+        return None
+    raise StatusConflict(current)
 
 
-def update_order(order_id: int, data: dict):
+@timed
+async def update_order(order_id: int, data: dict):
     """Update editable fields on an order (admin use)."""
     allowed = {"unit_number", "phone_number", "email", "delivery_notes",
                "cutlery", "order_type", "payment_method", "gcash_ref", "status"}
@@ -138,131 +402,113 @@ def update_order(order_id: int, data: dict):
     # Validate status if provided
     if "status" in clean and clean["status"] not in STATUS_FLOW:
         return None
-    res = (
-        supabase
-        .table("orders")
-        .update(clean)
-        .eq("id", order_id)
-        .execute()
-    )
-    return res.data[0] if res.data else None
+    order = await repo.update_order(order_id, clean)
+    if order:
+        _order_changed("updated", order)
+    return order
 
 
 # ========================================
 # CATEGORIES
 # ========================================
 
-def get_categories():
+@timed
+@cached(CATEGORIES_KEY)
+async def get_categories():
     """All categories sorted by sort_order."""
-    res = (
-        supabase
-        .table("categories")
-        .select("id,name,display_name,emoji,sort_order")
-        .order("sort_order")
-        .execute()
-    )
-    return res.data
+    return await repo.list_categories("id,name,display_name,emoji,sort_order")
 
 
-def create_category(data: dict):
+@timed
+async def create_category(data: dict):
     allowed = {"name", "display_name", "emoji", "sort_order"}
     row = {k: v for k, v in data.items() if k in allowed}
-    res = supabase.table("categories").insert(row).execute()
-    return res.data[0] if res.data else None
+    category = await repo.insert_category(row)
+    invalidate(CATEGORIES_KEY)
+    return category
 
 
-def update_category(cat_id: str, data: dict):
+@timed
+async def update_category(cat_id: str, data: dict):
     allowed = {"name", "display_name", "emoji", "sort_order"}
     clean = {k: v for k, v in data.items() if k in allowed}
     if not clean:
         return None
-    res = (
-        supabase
-        .table("categories")
-        .update(clean)
-        .eq("id", cat_id)
-        .execute()
-    )
-    return res.data[0] if res.data else None
-
-
-def delete_category(cat_id: str):
-    res = (
-        supabase
-        .table("categories")
-        .delete()
-        .eq("id", cat_id)
-        .execute()
-    )
-    return len(res.data) > 0
+    category = await repo.update_category(cat_id, clean)
+    invalidate(CATEGORIES_KEY)
+    return category
+
+
+@timed
+async def delete_category(cat_id: str):
+    deleted = await repo.delete_category(cat_id)
+    invalidate(CATEGORIES_KEY)
+    return deleted
 
 
 # ========================================
 # ADMIN: Menu management
 # ========================================
 
-def get_all_menu_items():
+@timed
+@cached(MENU_ALL_KEY)
+async def get_all_menu_items():
     """All items including unavailable (for admin view)."""
-    res = (
-        supabase
-        .table("menu_items")
-        .select("id,name,description,price,category,image_url,is_available")
-        .order("created_at")
-        .execute()
-    )
-    return res.data
-
-
-def toggle_item_availability(item_id: str, is_available: bool):
-    res = (
-        supabase
-        .table("menu_items")
-        .update({"is_available": is_available})
-        .eq("id", item_id)
-        .execute()
-    )
-    return res.data[0] if res.data else None
-
-
-def create_menu_item(data: dict):
-    allowed = {"name", "description", "price", "category", "image_url", "is_available"}
+    return await repo.list_menu_items(
+        "id,name,description,price,category,image_url,image_variants,is_available")
+
+
+_menu_index: tuple[object, dict] = (None, {})
+
+
+@timed
+async def get_menu_item(item_id: str):
+    """Single item (admin edit) via an id index over the cached full menu."""
+    global _menu_index
+    items = await get_all_menu_items()
+    if _menu_index[0] is not items:
+        _menu_index = (items, {str(i["id"]): i for i in items})
+    return _menu_index[1].get(str(item_id))
+
+
+@timed
+async def toggle_item_availability(item_id: str, is_available: bool):
+    item = await repo.update_menu_item(item_id, {"is_available": is_available})
+    invalidate(MENU_KEY, MENU_ALL_KEY)
+    return item
+
+
+@timed
+async def create_menu_item(data: dict):
+    allowed = {"name", "description", "price", "category", "image_url", "image_variants", "is_available"}
     row = {k: v for k, v in data.items() if k in allowed}
-    res = supabase.table("menu_items").insert(row).execute()
-    return res.data[0] if res.data else None
+    item = await repo.insert_menu_item(row)
+    invalidate(MENU_KEY, MENU_ALL_KEY)
+    return item
 
 
-def update_menu_item(item_id: str, data: dict):
-    allowed = {"name", "description", "price", "category", "image_url", "is_available"}
+@timed
+async def update_menu_item(item_id: str, data: dict):
+    allowed = {"name", "description", "price", "category", "image_url", "image_variants", "is_available"}
     clean = {k: v for k, v in data.items() if k in allowed}
     if not clean:
         return None
-    res = (
-        supabase
-        .table("menu_items")
-        .update(clean)
-        .eq("id", item_id)
-        .execute()
-    )
-    return res.data[0] if res.data else None
-
-
-def delete_menu_item(item_id: str):
-    res = (
-        supabase
-        .table("menu_items")
-        .delete()
-        .eq("id", item_id)
-        .execute()
-    )
-    return len(res.data) > 0
+    item = await repo.update_menu_item(item_id, clean)
+    invalidate(MENU_KEY, MENU_ALL_KEY)
+    return item
+
+
+@timed
+async def delete_menu_item(item_id: str):
+    deleted = await repo.delete_menu_item(item_id)
+    invalidate(MENU_KEY, MENU_ALL_KEY)
+    return deleted
 
 
 # ========================================
-# ADMIN: Image storage (Supabase bucket)
+# ADMIN: Image storage
 # ========================================
 
-MENU_BUCKET = "menu-images"
-
 MIME_TYPES = {
     ".jpg": "image/jpeg",
     ".jpeg": "image/jpeg",
@@ -272,77 +518,205 @@ MIME_TYPES = {
 }
 
 
-def upload_menu_image(filename: str, file_bytes: bytes, ext: str):
-    """Upload image to Supabase Storage and return its public URL."""
+@timed
+async def upload_menu_image(filename: str, file_bytes: bytes, ext: str):
+    """Store an uploaded image and return its public URL."""
     content_type = MIME_TYPES.get(ext, "application/octet-stream")
-    supabase.storage.from_(MENU_BUCKET).upload(
-        path=filename,
-        file=file_bytes,
-        file_options={"content-type": content_type},
-    )
-    public_url = supabase.storage.from_(MENU_BUCKET).get_public_url(filename)
-    return public_url
+    return await repo.upload_image(filename, file_bytes, content_type)
+
+
+@timed
+async def upload_menu_image_variants(filename: str, variants: list):
+    """Store resized WebP variants next to the original; return the srcset list."""
+    stem = os.path.splitext(filename)[0]
+
+    async def put(width: int, data: bytes):
+        url = await repo.upload_image(f"{stem}-{width}w.webp", data, "image/webp", cache_control="31536000")
+        return {"w": width, "url": url}
+
+    return list(await asyncio.gather(*(put(w, data) for w, data in variants)))
 
 
 # ========================================
 # ADMIN: Restaurant settings
 # ========================================
 
-def get_settings():
-    res = (
-        supabase
-        .table("restaurant_settings")
-        .select("*")
-        .eq("id", 1)
-        .single()
-        .execute()
-    )
-    return res.data
+@timed
+@cached(SETTINGS_KEY)
+async def get_settings():
+    return await repo.get_settings()
 
 
-def update_settings(data: dict):
+@timed
+async def update_settings(data: dict):
     allowed = {"accepting_orders", "prep_time_minutes"}
     clean = {k: v for k, v in data.items() if k in allowed}
     if not clean:
-        return get_settings()
-    res = (
-        supabase
-        .table("restaurant_settings")
-        .update(clean)
-        .eq("id", 1)
-        .execute()
-    )
-    return res.data[0]
+        return await get_settings()
+    settings = await repo.update_settings(clean)
+    invalidate(SETTINGS_KEY)
+    return settings
 
 
 # ========================================
 # ADMIN: Today's orders
 # ========================================
 
-def get_todays_orders():
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    res = (
-        supabase
-        .table("orders")
-        .select("*")
-        .gte("created_at", f"{today}T00:00:00+00:00")
-        .order("created_at", desc=True)
-        .execute()
-    )
-    return res.data
+@timed
+async def get_todays_orders():
+    start, end = _day_bounds(business_date())
+    return await repo.orders_between(start, end, "*", newest_first=True)
+
+
+# ========================================
+# ADMIN: Analytics
+# ========================================
+
+_ANALYTICS_FIELDS = "id,status,payment_method,total,items,created_at"
+
+
+def _day_bounds(day):
+    """UTC ISO bounds [start, end) of a local business day."""
+    start = datetime.combine(day, datetime.min.time(), tzinfo=BUSINESS_TZ)
+    end = start + timedelta(days=1)
+    return start.astimezone(timezone.utc).isoformat(), end.astimezone(timezone.utc).isoformat()
+
+
+@timed
+async def refresh_daily_analytics(force: bool = False):
+    """Reseed today's counters on day rollover or when they're getting old.
+
+    Between reseeds the counters are maintained per write by
+    _order_changed; reseeding also picks up writes from other workers.
+    """
+    day = business_date()
+    fresh = (daily_analytics.seeded_at is not None
+             and time.monotonic() - daily_analytics.seeded_at < ANALYTICS_RESEED_SECONDS)
+    if not force and daily_analytics.day == day and fresh:
+        return
+    cursor = order_events.cursor()
+    started = time.monotonic()
+    daily_analytics.seed(await _orders_for_day(day), day, started)
+    # Writes that landed while the query was in flight
+    for _, _, row in order_events.events_after(cursor) or ():
+        daily_analytics.apply(row)
+
+
+@timed
+async def get_daily_analytics():
+    await refresh_daily_analytics()
+    return daily_analytics.summary()
+
+
+# ========================================
+# ADMIN: Daily rollups & reports
+# ========================================
+
+async def _orders_for_day(day):
+    start, end = _day_bounds(day)
+    return await repo.orders_between(start, end, _ANALYTICS_FIELDS)
+
+
+@timed
+async def rollup_day(day):
+    """Aggregate one business day's orders into its daily_sales row."""
+    totals = DailyAnalytics()
+    totals.seed(await _orders_for_day(day), day)
+    row = totals.rollup_row()
+    await repo.upsert_daily_sales(row)
+    return row
+
+
+@timed
+async def rollup_closed_days():
+    """Roll up every closed day after the latest existing rollup."""
+    latest = await repo.latest_rollup_day()
+    if latest:
+        day = datetime.fromisoformat(latest).date() + timedelta(days=1)
+    else:
+        first = await repo.first_order_created_at()
+        if not first:
+            return 0
+        day = business_date(first)
+
+    today = business_date()
+    done = 0
+    while day < today:
+        await rollup_day(day)
+        day += timedelta(days=1)
+        done += 1
+    return done
+
+
+async def run_daily_rollup():
+    """Background task: close out finished business days."""
+    while True:
+        try:
+            await rollup_closed_days()
+        except Exception:
+            log.warning("daily rollup failed", exc_info=True)
+        await asyncio.sleep(ROLLUP_INTERVAL_SECONDS)
+
+
+@timed
+async def get_sales_report(date_from, date_to):
+    """Per-day rollups in [date_from, date_to] plus range totals."""
+    rows = await repo.daily_sales_between(date_from.isoformat(), date_to.isoformat())
+    return {
+        "from": date_from.isoformat(),
+        "to": date_to.isoformat(),
+        "totals": combine_rollups(rows),
+        "days": rows,
+    }
+
+
+# ========================================
+# ADMIN: Export
+# ========================================
+
+_EXPORT_FIELDS = "id,order_number,unit_number,order_type,payment_method,gcash_ref,items,total,status,created_at"
+
+
+@timed
+async def iter_order_pages(date_from=None, date_to=None, page_size: int = EXPORT_PAGE_SIZE):
+    """Orders in business days [date_from, date_to], oldest first, a page at a time.
+
+    Pages by a (created_at, id) keyset cursor rather than OFFSET, so each
+    page is an index range scan and only one page is held at a time.
+    """
+    start = _day_bounds(date_from)[0] if date_from else None
+    end = _day_bounds(date_to)[1] if date_to else None
+    after = None
+    while True:
+        rows = await repo.order_page(_EXPORT_FIELDS, start, end, after, page_size)
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        after = (rows[-1]["created_at"], rows[-1]["id"])
 
 
 # ========================================
 # ADMIN: Auth
 # ========================================
 
+def _sign(payload: str) -> str:
+    mac = hmac.new(_TOKEN_KEY, payload.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(mac).rstrip(b"=").decode()
+
+
 def verify_admin_password(password: str):
     if not secrets.compare_digest(password, ADMIN_PASSWORD):
         return None
-    token = secrets.token_hex(32)
-    _admin_tokens.add(token)
-    return token
+    payload = f"{int(time.time()) + ADMIN_TOKEN_TTL}.{secrets.token_urlsafe(12)}"
+    return f"{payload}.{_sign(payload)}"
 
 
 def verify_admin_token(token: str):
-    return token in _admin_tokens
+    """Check signature and expiry; no lookup, so any worker can verify."""
+    payload, _, sig = token.rpartition(".")
+    expires, _, _ = payload.partition(".")
+    if not expires.isdigit() or not secrets.compare_digest(sig.encode(), _sign(payload).encode()):
+        return False
+    return int(expires) > time.time()
@@ -0,0 +1,242 @@
+import os
+import re
+from supabase import AsyncClient, AsyncClientOptions
+from postgrest.exceptions import APIError
+from backend.services.repository import Repository, Rejected
+from backend.services.transport import make_http_client
+from backend.services.tracing import query_span
+
+MENU_BUCKET = "menu-images"
+# Postgres error classes for bad data and constraint violations: the row
+# itself is refused, so retrying can't help
+_REJECTED_SQLSTATES = ("22", "23")
+_SHAPE_KEYS = ("select", "order", "limit", "offset", "on_conflict", "columns")
+
+
+def _shape(params) -> str:
+    """Filter shape of a PostgREST query string, values dropped.
+
+    "status=neq.delivered&order=created_at.asc" -> "status=neq order=created_at.asc"
+    """
+    parts = []
+    for key, value in params.multi_items():
+        if key == "select":
+            continue
+        if key in _SHAPE_KEYS:
+            parts.append(f"{key}={value}" if key in ("order", "on_conflict") else key)
+        elif key in ("or", "and"):
+            parts.append(key + "(" + ",".join(re.findall(r"(\w+)\.(?:eq|neq|gt|gte|lt|lte|is|in)\.", value)) + ")")
+        else:
+            parts.append(f"{key}={value.split('.', 1)[0]}")
+    return " ".join(parts)
+
+
+class SupabaseRepository(Repository):
+    """PostgREST tables and the Storage bucket of the hosted project."""
+
+    name = "supabase"
+
+    def __init__(self):
+        url = os.getenv("SUPABASE_URL")
+        key = os.getenv("SUPABASE_SERVICE_ROLE") or os.getenv("SUPABASE_SERVICE_KEY")
+        if not url or not key:
+            raise RuntimeError("Supabase env vars missing")
+        # Async client so queries never block the event loop (service key
+        # needs no session bootstrap, so plain construction is enough -- no
+        # acreate_client). PostgREST and Storage share one pooled client
+        # behind the resilient transport (timeouts, retries, circuit breaker).
+        self.http_client, self.transport = make_http_client()
+        self.client = AsyncClient(url, key, options=AsyncClientOptions(httpx_client=self.http_client))
+
+    def table(self, name: str):
+        return self.client.table(name)
+
+    @staticmethod
+    async def _execute(query):
+        """Run a PostgREST query builder as one traced (and slow-logged) call.
+
+        Constraint and bad-value errors surface as Rejected, as they do
+        from the SQLite engine; any other APIError propagates as is.
+        """
+        request = query.request
+        table = request.path.path.rsplit("/", 1)[-1]
+        with query_span("supabase", table, request.http_method, _shape(request.params)):
+            try:
+                return await query.execute()
+            except APIError as exc:
+                if (exc.code or "").startswith(_REJECTED_SQLSTATES):
+                    raise Rejected(exc.message) from exc
+                raise
+
+    # --- Menu ---
+
+    async def list_menu_items(self, fields, available_only=False):
+        query = self.table("menu_items").select(fields)
+        if available_only:
+            query = query.eq("is_available", True)
+        res = await self._execute(query.order("created_at"))
+        return res.data
+
+    async def insert_menu_item(self, row):
+        res = await self._execute(self.table("menu_items").insert(row))
+        return res.data[0] if res.data else None
+
+    async def update_menu_item(self, item_id, fields):
+        res = await self._execute(self.table("menu_items").update(fields).eq("id", item_id))
+        return res.data[0] if res.data else None
+
+    async def delete_menu_item(self, item_id):
+        res = await self._execute(self.table("menu_items").delete().eq("id", item_id))
+        return len(res.data) > 0
+
+    # --- Categories ---
+
+    async def list_categories(self, fields):
+        res = await self._execute(self.table("categories").select(fields).order("sort_order"))
+        return res.data
+
+    async def insert_category(self, row):
+        res = await self._execute(self.table("categories").insert(row))
+        return res.data[0] if res.data else None
+
+    async def update_category(self, cat_id, fields):
+        res = await self._execute(self.table("categories").update(fields).eq("id", cat_id))
+        return res.data[0] if res.data else None
+
+    async def delete_category(self, cat_id):
+        res = await self._execute(self.table("categories").delete().eq("id", cat_id))
+        return len(res.data) > 0
+
+    # --- Settings ---
+
+    async def get_settings(self):
+        res = await self._execute(self.table("restaurant_settings").select("*").eq("id", 1).limit(1))
+        return res.data[0] if res.data else None
+
+    async def update_settings(self, fields):
+        res = await self._execute(self.table("restaurant_settings").update(fields).eq("id", 1))
+        return res.data[0] if res.data else None
+
+    # --- Orders ---
+
+    async def insert_order(self, row):
+        res = await self._execute(self.table("orders").insert(row))
+        return res.data[0]
+
+    async def insert_orders_once(self, rows):
+        # Conflicts on tracking_token are skipped and read back instead, so
+        # a retry after a lost response can't duplicate an order
+        res = await self._execute(
+            self.table("orders")
+            .upsert(rows, on_conflict="tracking_token", ignore_duplicates=True)
+        )
+        inserted = res.data or []
+        missing = {r["tracking_token"] for r in rows} - {r["tracking_token"] for r in inserted}
+        if missing:
+            existing = await self._execute(self.table("orders").select("*").in_("tracking_token", list(missing)))
+            inserted += existing.data
+        return inserted
+
+    async def get_order(self, order_id, fields="*"):
+        res = await self._execute(self.table("orders").select(fields).eq("id", order_id).limit(1))
+        return res.data[0] if res.data else None
+
+    async def get_order_by_token(self, token, fields):
+        res = await self._execute(self.table("orders").select(fields).eq("tracking_token", token).limit(1))
+        return res.data[0] if res.data else None
+
+    async def list_active_orders(self, fields):
+        res = await self._execute(
+            self.table("orders")
+            .select(fields)
+            .neq("status", "delivered")
+            .order("created_at", desc=False)
+        )
+        return res.data
+
+    async def orders_updated_since(self, since, fields):
+        res = await self._execute(
+            self.table("orders")
+            .select(fields)
+            .gte("updated_at", since)
+            .order("updated_at", desc=False)
+            .order("id", desc=False)
+        )
+        return res.data
+
+    async def update_order(self, order_id, fields, expected_status=None):
+        query = self.table("orders").update(fields).eq("id", order_id)
+        if expected_status is not None:
+            query = query.eq("status", expected_status)
+        res = await self._execute(query)
+        return res.data[0] if res.data else None
+
+    async def orders_between(self, start, end, fields, newest_first=False):
+        res = await self._execute(
+            self.table("orders")
+            .select(fields)
+            .gte("created_at", start)
+            .lt("created_at", end)
+            .order("created_at", desc=newest_first)
+        )
+        return res.data
+
+    async def first_order_created_at(self):
+        res = await self._execute(self.table("orders").select("created_at").order("created_at").limit(1))
+        return res.data[0]["created_at"] if res.data else None
+
+    async def order_page(self, fields, start=None, end=None, after=None, limit=500):
+        query = (
+            self.table("orders")
+            .select(fields)
+            .order("created_at", desc=False)
+            .order("id", desc=False)
+            .limit(limit)
+        )
+        if start:
+            query = query.gte("created_at", start)
+        if end:
+            query = query.lt("created_at", end)
+        if after:
+            ts, last_id = after
+            query = query.or_(f'created_at.gt."{ts}",and(created_at.eq."{ts}",id.gt.{last_id})')
+        res = await self._execute(query)
+        return res.data
+
+    # --- Daily sales ---
+
+    async def latest_rollup_day(self):
+        res = await self._execute(self.table("daily_sales").select("day").order("day", desc=True).limit(1))
+        return res.data[0]["day"] if res.data else None
+
+    async def upsert_daily_sales(self, row):
+        await self._execute(self.table("daily_sales").upsert(row))
+
+    async def daily_sales_between(self, date_from, date_to):
+        res = await self._execute(
+            self.table("daily_sales")
+            .select("day,order_count,revenue,items,payments")
+            .gte("day", date_from)
+            .lte("day", date_to)
+            .order("day")
+        )
+        return res.data
+
+    # --- Images ---
+
+    async def upload_image(self, path, data, content_type, cache_control=None):
+        options = {"content-type": content_type}
+        if cache_control:
+            options["cache-control"] = cache_control
+        bucket = self.client.storage.from_(MENU_BUCKET)
+        with query_span("supabase", f"storage:{MENU_BUCKET}", "upload"):
+            await bucket.upload(path=path, file=data, file_options=options)
+        return await bucket.get_public_url(path)
+
+    # --- Lifecycle ---
+
+    async def aclose(self):
+        await self.http_client.aclose()
+
+    def stats(self):
+        return {"backend": self.name, **self.transport.stats()}
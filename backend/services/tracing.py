@@ -0,0 +1,234 @@
+import os
+import json
+import time
+import queue
+import secrets
+import logging
+import itertools
+import contextvars
+from datetime import datetime, timezone
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from starlette.routing import Route
+from starlette.responses import JSONResponse as _JSONResponse
+from backend.services.routes import route_template
+
+# Per-request span trees. The middleware opens a trace for each request;
+# handlers, body reads, database calls and JSON rendering add spans to it
+# through context variables, so nothing is threaded through call
+# signatures. A finished trace is one JSON line in a rotating local file,
+# written by logging's queue listener thread so the event loop never
+# waits on disk. Database calls slower than SLOW_QUERY_MS also go to the
+# slow-query log, inside a request or not.
+TRACING = os.getenv("TRACING", "1") != "0"
+TRACE_PATH = os.getenv("TRACE_PATH", os.path.join("data", "traces.jsonl"))
+TRACE_MAX_BYTES = int(os.getenv("TRACE_MAX_BYTES", str(20 * 1024 * 1024)))
+TRACE_BACKUPS = int(os.getenv("TRACE_BACKUPS", "5"))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "250"))
+SLOW_QUERY_PATH = os.getenv("SLOW_QUERY_PATH", os.path.join("data", "slow_queries.log"))
+
+_trace_log = logging.getLogger("backend.traces")
+_trace_log.propagate = False
+_trace_log.setLevel(logging.INFO)
+slow_log = logging.getLogger("backend.slow_queries")
+
+_trace: contextvars.ContextVar = contextvars.ContextVar("trace", default=None)
+_parent: contextvars.ContextVar = contextvars.ContextVar("span_parent", default=0)
+_listener: QueueListener | None = None
+
+
+class Trace:
+    """Spans of one request; ids are small ints, 0 is "no parent"."""
+
+    __slots__ = ("trace_id", "t0", "spans", "_ids")
+
+    def __init__(self):
+        self.trace_id = secrets.token_hex(8)
+        self.t0 = time.perf_counter()
+        self.spans: list[dict] = []
+        self._ids = itertools.count(1)
+
+    def new_id(self) -> int:
+        return next(self._ids)
+
+    def add(self, span_id: int, parent: int, name: str, began: float, ended: float, attrs: dict):
+        self.spans.append({
+            "id": span_id, "parent": parent, "name": name,
+            "start_ms": round((began - self.t0) * 1000, 3),
+            "duration_ms": round((ended - began) * 1000, 3),
+            **attrs,
+        })
+
+
+def current_trace_id() -> str | None:
+    trace = _trace.get()
+    return trace.trace_id if trace else None
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time the enclosed block as a child of the current span (no-op untraced)."""
+    trace = _trace.get()
+    if trace is None:
+        yield attrs
+        return
+    parent = _parent.get()
+    span_id = trace.new_id()
+    token = _parent.set(span_id)
+    began = time.perf_counter()
+    try:
+        yield attrs
+    except StopAsyncIteration:
+        raise  # an exhausted generator, not a failure
+    except BaseException as exc:
+        attrs["error"] = type(exc).__name__
+        raise
+    finally:
+        _parent.reset(token)
+        trace.add(span_id, parent, name, began, time.perf_counter(), attrs)
+
+
+def record(name: str, began: float, ended: float, **attrs):
+    """Add an already-timed span under the current one."""
+    trace = _trace.get()
+    if trace is not None:
+        trace.add(trace.new_id(), _parent.get(), name, began, ended, attrs)
+
+
+@contextmanager
+def query_span(backend: str, table: str, op: str, shape: str = ""):
+    """A database call: traced like any span, and slow-logged past SLOW_QUERY_MS."""
+    began = time.perf_counter()
+    with span("db", backend=backend, table=table, op=op, shape=shape) as attrs:
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - began) * 1000
+            if elapsed_ms >= SLOW_QUERY_MS:
+                attrs["slow"] = True
+                slow_log.warning("%.1fms %s %s %s %s trace=%s", elapsed_ms, backend, op, table,
+                                 shape or "-", current_trace_id() or "-")
+
+
+# ========================================
+# Request spans
+# ========================================
+
+class JSONResponse(_JSONResponse):
+    """JSONResponse whose rendering shows up as a json.serialize span."""
+
+    def render(self, content) -> bytes:
+        with span("json.serialize") as attrs:
+            body = super().render(content)
+            attrs["bytes"] = len(body)
+        return body
+
+
+def _traced_handler(app, endpoint: str):
+    async def handler(scope, receive, send):
+        with span("handler", endpoint=endpoint):
+            await app(scope, receive, send)
+    return handler
+
+
+def trace_routes(app):
+    """Give every registered route handler its own span (call once routes exist)."""
+    if not TRACING:
+        return
+    for route in app.routes:
+        if isinstance(route, Route) and not getattr(route.app, "_traced", False):
+            route.app = _traced_handler(route.app, route.name or route.path)
+            route.app._traced = True
+
+
+class TracingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not TRACING:
+            return await self.app(scope, receive, send)
+        trace = Trace()
+        root = trace.new_id()
+        trace_token, parent_token = _trace.set(trace), _parent.set(root)
+        status = 500
+        body_began, body_bytes = None, 0
+
+        async def receive_wrapper():
+            nonlocal body_began, body_bytes
+            began = time.perf_counter()
+            message = await receive()
+            if message["type"] == "http.request":
+                body_began = body_began or began
+                body_bytes += len(message.get("body", b""))
+                if body_bytes and not message.get("more_body", False):
+                    record("request.body", body_began, time.perf_counter(), bytes=body_bytes)
+            return message
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [*message.get("headers", []),
+                                      (b"x-trace-id", trace.trace_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            _parent.reset(parent_token)
+            _trace.reset(trace_token)
+            ended = time.perf_counter()
+            route = route_template(scope)
+            trace.add(root, 0, "request", trace.t0, ended, {"method": scope["method"], "route": route})
+            if _listener is not None:
+                _trace_log.info(json.dumps({
+                    "trace_id": trace.trace_id,
+                    "ts": datetime.now(timezone.utc).isoformat(),
+                    "method": scope["method"],
+                    "route": route,
+                    "status": status,
+                    "duration_ms": round((ended - trace.t0) * 1000, 3),
+                    "spans": sorted(trace.spans, key=lambda s: s["start_ms"]),
+                }, separators=(",", ":"), default=str))
+
+
+# ========================================
+# Writers
+# ========================================
+
+def _file_handler(path: str, fmt: str, logger_name: str) -> logging.Handler:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    handler = RotatingFileHandler(path, maxBytes=TRACE_MAX_BYTES, backupCount=TRACE_BACKUPS, encoding="utf-8")
+    handler.setFormatter(logging.Formatter(fmt))
+    handler.addFilter(logging.Filter(logger_name))
+    return handler
+
+
+def start_tracing():
+    """Start the background writer for traces and the slow-query log."""
+    global _listener
+    if _listener is not None:
+        return
+    records = queue.SimpleQueue()
+    handlers = [_file_handler(SLOW_QUERY_PATH, "%(asctime)s %(message)s", slow_log.name)]
+    if TRACING:
+        handlers.append(_file_handler(TRACE_PATH, "%(message)s", _trace_log.name))
+    _listener = QueueListener(records, *handlers)
+    _listener.start()
+    for logger in (_trace_log, slow_log):
+        logger.addHandler(QueueHandler(records))
+
+
+def stop_tracing():
+    """Flush queued lines and stop the writer thread."""
+    global _listener
+    if _listener is None:
+        return
+    for logger in (_trace_log, slow_log):
+        for handler in [h for h in logger.handlers if isinstance(h, QueueHandler)]:
+            logger.removeHandler(handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
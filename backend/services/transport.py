@@ -0,0 +1,182 @@
+import os
+import time
+import random
+import asyncio
+import logging
+import httpx
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 multiplexing on the pool)
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+# Shared HTTP transport under every Supabase call (PostgREST and Storage).
+# One pooled keep-alive client; per-operation timeouts; retries only where
+# a repeat can't double-apply; and a circuit breaker that fails fast while
+# the database is degraded, so cached reads can be served instead.
+POOL_MAX_CONNECTIONS = int(os.getenv("SUPABASE_POOL_MAX", "20"))
+POOL_MAX_KEEPALIVE = int(os.getenv("SUPABASE_POOL_KEEPALIVE", "10"))
+POOL_KEEPALIVE_EXPIRY = 30.0
+
+TIMEOUTS = {  # seconds, per operation kind
+    "read": float(os.getenv("SUPABASE_READ_TIMEOUT", "5")),
+    "write": float(os.getenv("SUPABASE_WRITE_TIMEOUT", "10")),
+    "upload": float(os.getenv("SUPABASE_UPLOAD_TIMEOUT", "30")),
+}
+CONNECT_TIMEOUT = 3.0
+RETRIES = int(os.getenv("SUPABASE_RETRIES", "2"))
+RETRY_BASE_DELAY = 0.1
+RETRY_MAX_DELAY = 2.0
+RETRY_STATUSES = {429, 502, 503, 504}
+
+BREAKER_FAILURES = int(os.getenv("SUPABASE_BREAKER_FAILURES", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("SUPABASE_BREAKER_RESET_SECONDS", "15"))
+
+log = logging.getLogger(__name__)
+
+
+class CircuitOpen(httpx.TransportError):
+    """Raised without touching the network while the breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open probe."""
+
+    def __init__(self, failures: int = BREAKER_FAILURES, reset_after: float = BREAKER_RESET_SECONDS):
+        self.threshold = failures
+        self.reset_after = reset_after
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._probe_at = None
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        now = time.monotonic()
+        if self.state == "open" and now - self.opened_at >= self.reset_after:
+            self.state = "half_open"
+        # One request at a time tests the water (a cancelled probe expires)
+        if self.state == "half_open" and (self._probe_at is None or now - self._probe_at >= self.reset_after):
+            self._probe_at = now
+            return True
+        return False
+
+    def success(self):
+        if self.state != "closed":
+            log.info("supabase circuit closed")
+        self.state = "closed"
+        self.failures = 0
+        self._probe_at = None
+
+    def failure(self):
+        self.failures += 1
+        self._probe_at = None
+        if self.state == "half_open" or self.failures >= self.threshold:
+            if self.state != "open":
+                self.times_opened += 1
+                log.warning("supabase circuit opened after %d failures", self.failures)
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+            "open_for_seconds": round(time.monotonic() - self.opened_at, 1) if self.state != "closed" else 0.0,
+        }
+
+
+def operation(request: httpx.Request) -> str:
+    if "/storage/v1/object" in request.url.path and request.method in ("POST", "PUT"):
+        return "upload"
+    return "read" if request.method in ("GET", "HEAD") else "write"
+
+
+def idempotent(request: httpx.Request) -> bool:
+    """Whether re-sending the request after an unknown outcome is harmless.
+
+    PATCH is excluded: status advances are compare-and-set, and a replay of
+    one that already applied would report a spurious conflict. Upserts and
+    storage overwrites converge, so they may be repeated.
+    """
+    if request.method in ("GET", "HEAD", "OPTIONS", "PUT", "DELETE"):
+        return True
+    prefer = request.headers.get("prefer", "")
+    return "resolution=" in prefer or request.headers.get("x-upsert") == "true"
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport, breaker: CircuitBreaker = None, retries: int = RETRIES):
+        self.inner = inner
+        self.breaker = breaker or CircuitBreaker()
+        self.retries = retries
+        self.counters = {op: {"requests": 0, "errors": 0, "timeouts": 0, "retries": 0, "short_circuited": 0}
+                         for op in TIMEOUTS}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        op = operation(request)
+        counts = self.counters[op]
+        counts["requests"] += 1
+        if not self.breaker.allow():
+            counts["short_circuited"] += 1
+            raise CircuitOpen("Supabase circuit open", request=request)
+
+        request.extensions["timeout"] = httpx.Timeout(TIMEOUTS[op], connect=CONNECT_TIMEOUT).as_dict()
+        retry_ok = idempotent(request)
+        # postgrest-py re-sends GETs on 503 itself (tagged X-Retry-Count);
+        # don't multiply its attempts by ours
+        retries = 0 if "x-retry-count" in request.headers else self.retries
+        attempt = 0
+        while True:
+            try:
+                response = await self.inner.handle_async_request(request)
+            except httpx.TransportError as exc:
+                counts["errors"] += 1
+                counts["timeouts"] += isinstance(exc, httpx.TimeoutException)
+                self.breaker.failure()
+                # A failed connect never reached the server: always safe to retry
+                sent = not isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+                if attempt >= retries or (sent and not retry_ok) or not self.breaker.allow():
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    if response.status_code < 500:
+                        self.breaker.success()
+                    else:
+                        self.breaker.failure()
+                    return response
+                counts["errors"] += 1
+                self.breaker.failure()
+                if attempt >= retries or not retry_ok or not self.breaker.allow():
+                    return response
+                await response.aclose()
+            attempt += 1
+            counts["retries"] += 1
+            # Exponential backoff with full jitter
+            await asyncio.sleep(random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)))
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+    def stats(self) -> dict:
+        return {"breaker": self.breaker.stats(), "operations": self.counters, "retries_allowed": self.retries}
+
+
+def make_http_client() -> tuple[httpx.AsyncClient, ResilientTransport]:
+    """Pooled keep-alive client wrapped in the resilient transport."""
+    limits = httpx.Limits(
+        max_connections=POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=POOL_MAX_KEEPALIVE,
+        keepalive_expiry=POOL_KEEPALIVE_EXPIRY,
+    )
+    transport = ResilientTransport(httpx.AsyncHTTPTransport(limits=limits, http2=HTTP2, retries=0))
+    client = httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(TIMEOUTS["read"], connect=CONNECT_TIMEOUT),
+        follow_redirects=True,
+    )
+    return client, transport
@@ -0,0 +1,305 @@
+"""End-to-end load test of the ordering API.
+
+    python -m bench.loadtest --duration 60 --tenants 50 --trackers 500
+
+Without --url this seeds a SQLite database (bench.seed), starts uvicorn on
+it with STORAGE_BACKEND=sqlite, so Supabase is never touched, and drives
+it over real HTTP. Scripted scenarios run concurrently:
+
+  tenant   - open the page, load the catalog, check out, watch the order
+  tracker  - a phone polling /api/orders/track/{token}
+  kitchen  - delta-poll the board and advance the oldest order
+  admin    - refresh analytics and today's orders every 10s
+
+Reports throughput and latency percentiles per route and checks them
+against bench/thresholds.json; exits 1 on a regression.
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import subprocess
+import httpx
+from bench.seed import seed
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+THRESHOLDS = os.path.join(ROOT, "bench", "thresholds.json")
+
+
+class Recorder:
+    """Latency samples per route label, kept only after warm-up."""
+
+    def __init__(self):
+        self.samples: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+        self.recording = False
+        self.started = self.stopped = 0.0
+
+    def start(self):
+        self.recording = True
+        self.started = time.perf_counter()
+
+    def stop(self):
+        self.recording = False
+        self.stopped = time.perf_counter()
+
+    async def call(self, client: httpx.AsyncClient, label: str, method: str, url: str, ok=(200,), **kwargs):
+        began = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            failed = response.status_code not in ok
+        except httpx.HTTPError:
+            response, failed = None, True
+        if self.recording:
+            self.samples.setdefault(label, []).append(time.perf_counter() - began)
+            if failed:
+                self.errors[label] = self.errors.get(label, 0) + 1
+        return None if failed else response
+
+    def report(self) -> dict:
+        elapsed = max(self.stopped - self.started, 1e-9)
+        out = {}
+        for label, samples in sorted(self.samples.items()):
+            ordered = sorted(samples)
+            out[label] = {
+                "requests": len(ordered),
+                "errors": self.errors.get(label, 0),
+                "rps": round(len(ordered) / elapsed, 1),
+                "p50_ms": _pct(ordered, 50),
+                "p90_ms": _pct(ordered, 90),
+                "p99_ms": _pct(ordered, 99),
+                "max_ms": round(ordered[-1] * 1000, 2),
+            }
+        return out
+
+
+def _pct(ordered: list[float], p: float) -> float:
+    """Nearest-rank percentile, in milliseconds."""
+    index = max(0, min(len(ordered) - 1, round(p / 100 * len(ordered) + 0.5) - 1))
+    return round(ordered[index] * 1000, 2)
+
+
+# ========================================
+# Scenarios
+# ========================================
+
+async def tenant(client, rec, stop, ctx):
+    rng = random.Random()
+    etags = {}
+    while not stop.is_set():
+        await rec.call(client, "GET /", "GET", "/")
+        for path in ("/api/menu", "/api/categories", "/api/settings"):
+            headers = {"If-None-Match": etags[path]} if path in etags else {}
+            response = await rec.call(client, f"GET {path}", "GET", path, ok=(200, 304), headers=headers)
+            if response is not None and response.status_code == 200:
+                etags[path] = response.headers.get("etag", "")
+                if path == "/api/menu":
+                    ctx["menu"] = response.json()
+        if not ctx["menu"]:
+            await asyncio.sleep(1)
+            continue
+        await asyncio.sleep(rng.uniform(*ctx["think"]))
+        picks = rng.sample(ctx["menu"], min(len(ctx["menu"]), rng.randint(1, 4)))
+        items = [{"id": m["id"], "name": m["name"], "price": m["price"], "quantity": rng.randint(1, 3),
+                  "notes": ""} for m in picks]
+        response = await rec.call(client, "POST /api/orders", "POST", "/api/orders", ok=(201,), json={
+            "unit_number": f"{rng.randint(1, 30)}{rng.choice('ABCDEFGH')}",
+            "phone_number": "09171234567",
+            "items": items,
+            "total": sum(i["price"] * i["quantity"] for i in items),
+            "payment_method": rng.choice(["cash", "gcash"]),
+        })
+        if response is None:
+            continue
+        token = response.json()["tracking_token"]
+        ctx["tokens"].append(token)
+        for _ in range(3):
+            await asyncio.sleep(ctx["track_interval"])
+            await rec.call(client, "GET /api/orders/track/{token}", "GET", f"/api/orders/track/{token}")
+
+
+async def tracker(client, rec, stop, ctx):
+    await asyncio.sleep(random.uniform(0, ctx["track_interval"]))  # spread the phones out
+    while not stop.is_set():
+        if ctx["tokens"]:
+            token = random.choice(ctx["tokens"])
+            await rec.call(client, "GET /api/orders/track/{token}", "GET", f"/api/orders/track/{token}")
+        await asyncio.sleep(ctx["track_interval"])
+
+
+async def kitchen(client, rec, stop, ctx):
+    board, cursor = {}, ""
+    while not stop.is_set():
+        response = await rec.call(client, "GET /api/orders?since", "GET", "/api/orders",
+                                  params={"since": cursor})
+        if response is not None:
+            delta = response.json()
+            if delta["full"]:
+                board = {}
+            for order in delta["orders"]:
+                board[order["id"]] = order
+            for order_id in delta["removed"]:
+                board.pop(order_id, None)
+            cursor = delta["cursor"]
+        if board:
+            oldest = min(board.values(), key=lambda o: o["created_at"])
+            await rec.call(client, "POST /api/orders/{order_id}/advance", "POST",
+                           f"/api/orders/{oldest['id']}/advance", ok=(200, 409),
+                           json={"from": oldest["status"]})
+        await asyncio.sleep(ctx["kitchen_interval"])
+
+
+async def admin(client, rec, stop, ctx):
+    headers = {"Authorization": f"Bearer {ctx['admin_token']}"}
+    while not stop.is_set():
+        await rec.call(client, "GET /api/admin/analytics", "GET", "/api/admin/analytics", headers=headers)
+        await rec.call(client, "GET /api/admin/orders/today", "GET", "/api/admin/orders/today", headers=headers)
+        await asyncio.sleep(ctx["admin_interval"])
+
+
+# ========================================
+# Server under test
+# ========================================
+
+def start_server(db_path: str, port: int) -> subprocess.Popen:
+    env = {**os.environ, "STORAGE_BACKEND": "sqlite", "SQLITE_PATH": db_path}
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+
+
+async def wait_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/api/settings")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not become ready")
+
+
+# ========================================
+# Thresholds
+# ========================================
+
+def check(report: dict, thresholds: dict) -> list[str]:
+    """Regressions against {"route": {"p99_ms": .., "min_rps": ..}, "max_error_rate": ..}."""
+    failures = []
+    max_error_rate = thresholds.get("max_error_rate", 0.01)
+    for label, stats in report.items():
+        if stats["requests"] and stats["errors"] / stats["requests"] > max_error_rate:
+            failures.append(f"{label}: error rate {stats['errors']}/{stats['requests']}")
+    for label, limits in thresholds.get("routes", {}).items():
+        stats = report.get(label)
+        if stats is None:
+            failures.append(f"{label}: no samples")
+            continue
+        for key, limit in limits.items():
+            if key == "min_rps" and stats["rps"] < limit:
+                failures.append(f"{label}: {stats['rps']} rps < {limit}")
+            elif key.endswith("_ms") and stats[key] > limit:
+                failures.append(f"{label}: {key} {stats[key]} > {limit}")
+    return failures
+
+
+def print_report(report: dict, seconds: float):
+    print(f"\n{'route':42} {'reqs':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}")
+    for label, s in report.items():
+        print(f"{label:42} {s['requests']:>7} {s['errors']:>5} {s['rps']:>8} "
+              f"{s['p50_ms']:>8} {s['p90_ms']:>8} {s['p99_ms']:>8} {s['max_ms']:>8}")
+    total = sum(s["requests"] for s in report.values())
+    print(f"\n{total} requests in {seconds:.1f}s ({total / seconds:.1f} rps); latencies in ms")
+
+
+async def run(args) -> int:
+    server = None
+    rec = Recorder()
+    base_url = args.url
+    if not base_url:
+        if args.reseed or not os.path.exists(args.db):
+            print(f"seeding {args.db} ...")
+            await seed(args.db, args.menu_items, args.orders)
+        server = start_server(os.path.abspath(args.db), args.port)
+        base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        await wait_ready(base_url)
+        limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+            auth = await client.post("/api/admin/auth", json={"password": args.admin_password})
+            admin_token = auth.json().get("token") if auth.status_code == 200 else None
+            tokens = []
+            if admin_token:
+                today = await client.get("/api/admin/orders/today",
+                                         headers={"Authorization": f"Bearer {admin_token}"})
+                tokens = [o["tracking_token"] for o in today.json()]
+            ctx = {
+                "menu": [], "tokens": tokens, "admin_token": admin_token,
+                "think": (0.2, 1.0), "track_interval": args.track_interval,
+                "kitchen_interval": 1.0, "admin_interval": 10.0,
+            }
+            stop = asyncio.Event()
+            tasks = [asyncio.create_task(tenant(client, rec, stop, ctx)) for _ in range(args.tenants)]
+            tasks += [asyncio.create_task(tracker(client, rec, stop, ctx)) for _ in range(args.trackers)]
+            tasks += [asyncio.create_task(kitchen(client, rec, stop, ctx)) for _ in range(args.kitchens)]
+            if admin_token:
+                tasks += [asyncio.create_task(admin(client, rec, stop, ctx)) for _ in range(args.admins)]
+            await asyncio.sleep(args.warmup)
+            rec.start()
+            await asyncio.sleep(args.duration)
+            rec.stop()
+            stop.set()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    report = rec.report()
+    print_report(report, rec.stopped - rec.started)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "routes": report}, f, indent=2)
+    if args.no_check:
+        return 0
+    with open(args.thresholds) as f:
+        failures = check(report, json.load(f))
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="target a running server instead of starting one")
+    parser.add_argument("--db", default=os.path.join(ROOT, "data", "bench.db"))
+    parser.add_argument("--reseed", action="store_true", help="regenerate the synthetic database")
+    parser.add_argument("--menu-items", type=int, default=2000)
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--warmup", type=float, default=10,
+                        help="seconds of load before recording (startup rollups, cold caches)")
+    parser.add_argument("--tenants", type=int, default=50)
+    parser.add_argument("--trackers", type=int, default=500)
+    parser.add_argument("--kitchens", type=int, default=2)
+    parser.add_argument("--admins", type=int, default=1)
+    parser.add_argument("--track-interval", type=float, default=5.0, help="seconds between phone polls")
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--admin-password", default=os.getenv("ADMIN_PASSWORD", "admin"))
+    parser.add_argument("--thresholds", default=THRESHOLDS)
+    parser.add_argument("--json", help="also write the report here")
+    parser.add_argument("--no-check", action="store_true", help="report only, never fail")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Synthetic data for load tests: a large menu and months of order history.
+
+    python -m bench.seed --db data/bench.db --menu-items 2000 --orders 100000
+
+Writes straight into a SQLite database (the embedded storage backend), so
+the server under test can run with STORAGE_BACKEND=sqlite and no network.
+"""
+import os
+import uuid
+import random
+import asyncio
+import argparse
+from datetime import datetime, timedelta, timezone
+from backend.services.analytics import BUSINESS_TZ
+from backend.services.sqlite_repo import SQLiteRepository
+
+CATEGORIES = [
+    ("mains", "Mains", "🍛"), ("sides", "Sides", "🥗"), ("drinks", "Drinks", "🥤"),
+    ("noodles", "Noodles", "🍜"), ("rice", "Rice Meals", "🍚"), ("grill", "Grill", "🍢"),
+    ("soups", "Soups", "🍲"), ("desserts", "Desserts", "🍰"), ("breakfast", "Breakfast", "🍳"),
+    ("snacks", "Snacks", "🍟"), ("coffee", "Coffee", "☕"), ("specials", "Specials", "⭐"),
+]
+ADJECTIVES = ["Crispy", "Garlic", "Spicy", "Sweet", "Smoky", "Classic", "Lola's", "Sizzling", "Creamy", "Tangy"]
+DISHES = ["Adobo", "Sinigang", "Sisig", "Pancit", "Lechon", "Kare-Kare", "Tapa", "Longganisa",
+          "Lumpia", "Bulalo", "Halo-Halo", "Tocino", "Inasal", "Bicol Express", "Dinuguan", "Palabok"]
+PAYMENTS = ["cash", "cash", "cash", "gcash"]  # roughly the mix we see
+OPEN_HOUR, CLOSE_HOUR = 10, 22
+CHUNK = 10_000
+
+
+def menu_rows(rng: random.Random, count: int) -> list[dict]:
+    created = datetime.now(timezone.utc) - timedelta(days=400)
+    rows = []
+    for i in range(count):
+        cat = CATEGORIES[i % len(CATEGORIES)][0]
+        rows.append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "name": f"{rng.choice(ADJECTIVES)} {rng.choice(DISHES)} #{i + 1}",
+            "description": "Synthetic item for load testing",
+            "price": float(rng.randrange(40, 600, 5)),
+            "category": cat,
+            "image_url": None,
+            "image_variants": None,
+            "is_available": rng.random() > 0.1,
+            "created_at": (created + timedelta(seconds=i)).isoformat(),
+        })
+    return rows
+
+
+def order_rows(rng: random.Random, menu: list[dict], count: int, days: int, active: int):
+    """Yield orders spread over the last `days` business days, oldest first.
+
+    The last `active` orders land today and are left in kitchen statuses.
+    """
+    today = datetime.now(BUSINESS_TZ).date()
+    available = [m for m in menu if m["is_available"]] or menu
+    history = count - active
+    for n in range(count):
+        if n < history:
+            day = today - timedelta(days=days - (n * days) // max(history, 1))
+            status = "delivered"
+        else:
+            day = today
+            status = rng.choice(["new", "preparing", "ready"])
+        local = datetime(day.year, day.month, day.day, OPEN_HOUR, tzinfo=BUSINESS_TZ)
+        created = local + timedelta(seconds=rng.randrange((CLOSE_HOUR - OPEN_HOUR) * 3600))
+        if day == today:
+            created = min(created, datetime.now(BUSINESS_TZ) - timedelta(minutes=1))
+        items = []
+        for menu_item in rng.sample(available, rng.randint(1, 4)):
+            items.append({"id": menu_item["id"], "name": menu_item["name"],
+                          "price": menu_item["price"], "quantity": rng.randint(1, 3), "notes": ""})
+        method = rng.choice(PAYMENTS)
+        yield {
+            "order_number": rng.randint(1000, 9999),
+            "unit_number": f"{rng.randint(1, 30)}{rng.choice('ABCDEFGH')}",
+            "phone_number": f"09{rng.randint(100000000, 999999999)}",
+            "cutlery": rng.random() < 0.3,
+            "order_type": "delivery" if rng.random() < 0.8 else "pickup",
+            "payment_method": method,
+            "gcash_ref": f"{rng.randint(10**12, 10**13 - 1)}" if method == "gcash" else None,
+            "items": items,
+            "total": round(sum(i["price"] * i["quantity"] for i in items), 2),
+            "tracking_token": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "status": status,
+            "created_at": created.isoformat(),
+        }
+
+
+async def seed(path: str, menu_items: int = 2000, orders: int = 100_000, days: int = 180,
+               active: int = 40, seed_value: int = 42):
+    """Create (or replace) a SQLite database filled with synthetic data."""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    rng = random.Random(seed_value)
+    repo = SQLiteRepository(path)
+    existing = {c["name"] for c in await repo.list_categories("name")}
+    await repo.bulk_insert("categories", [
+        {"name": name, "display_name": label, "emoji": emoji, "sort_order": i + 1,
+         "created_at": datetime.now(timezone.utc).isoformat()}
+        for i, (name, label, emoji) in enumerate(CATEGORIES) if name not in existing
+    ])
+    menu = menu_rows(rng, menu_items)
+    await repo.bulk_insert("menu_items", menu)
+    chunk = []
+    for row in order_rows(rng, menu, orders, days, min(active, orders)):
+        chunk.append(row)
+        if len(chunk) == CHUNK:
+            await repo.bulk_insert("orders", chunk)
+            chunk = []
+    await repo.bulk_insert("orders", chunk)
+    await repo.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=os.path.join("data", "bench.db"))
+    parser.add_argument("--menu-items", type=int, default=2000)
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--active", type=int, default=40, help="orders left open today")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(seed(args.db, args.menu_items, args.orders, args.days, args.active, args.seed))
+    print(f"seeded {args.db}: {args.menu_items} menu items, {args.orders} orders over {args.days} days")
+
+
+if __name__ == "__main__":
+    main()
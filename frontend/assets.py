@@ -0,0 +1,123 @@
+import os
+import gzip
+import json
+import hashlib
+import mimetypes
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.staticfiles import StaticFiles
+from backend.services.compression import accepted_encodings
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Startup asset pipeline: static/js and static/css are minified, content-
+# hashed and precompressed into static/dist, and pages link them through
+# the manifest so the hashed URLs can be cached forever.
+STATIC_DIR = "static"
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+DIST_URL = "/static/dist"
+ASSET_SOURCES = ("js", "css")
+
+_manifest: dict[str, str] = {}
+
+
+def _minify(rel_path: str, text: str) -> str:
+    if rel_path.endswith(".js") and rjsmin:
+        return rjsmin.jsmin(text)
+    if rel_path.endswith(".css") and rcssmin:
+        return rcssmin.cssmin(text)
+    return text
+
+
+def _write(path: str, data: bytes):
+    """Write atomically so concurrent workers building at once never clash."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _prune(directory: str, current: set[str]):
+    """Remove fingerprinted files (and their .gz/.br) from older builds."""
+    for name in os.listdir(directory):
+        base = name.removesuffix(".gz").removesuffix(".br")
+        if base not in current and not name.endswith(".tmp"):
+            os.remove(os.path.join(directory, name))
+
+
+def build_assets(static_dir: str = STATIC_DIR, dist_dir: str = DIST_DIR) -> dict[str, str]:
+    """Fingerprint and precompress every JS/CSS file; return the manifest."""
+    manifest = {}
+    for sub in ASSET_SOURCES:
+        src_dir = os.path.join(static_dir, sub)
+        if not os.path.isdir(src_dir):
+            continue
+        os.makedirs(os.path.join(dist_dir, sub), exist_ok=True)
+        for name in sorted(os.listdir(src_dir)):
+            rel_path = f"{sub}/{name}"
+            with open(os.path.join(src_dir, name), encoding="utf-8") as f:
+                data = _minify(rel_path, f.read()).encode("utf-8")
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            stem, ext = os.path.splitext(name)
+            hashed = f"{sub}/{stem}.{digest}{ext}"
+            out = os.path.join(dist_dir, hashed)
+            if not os.path.exists(out):
+                _write(out + ".gz", gzip.compress(data, compresslevel=9, mtime=0))
+                if brotli:
+                    _write(out + ".br", brotli.compress(data, quality=11))
+                _write(out, data)
+            manifest[rel_path] = f"{DIST_URL}/{hashed}"
+        _prune(os.path.join(dist_dir, sub), {os.path.basename(u) for u in manifest.values()})
+    _write(os.path.join(dist_dir, "manifest.json"), json.dumps(manifest, indent=2).encode())
+    _manifest.clear()
+    _manifest.update(manifest)
+    return manifest
+
+
+def assets_version() -> str:
+    """Changes whenever a build produces different hashed files."""
+    return hashlib.sha256(json.dumps(_manifest, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def asset_url(rel_path: str) -> str:
+    """Hashed URL for e.g. 'css/tenant.css', or the plain path before a build."""
+    return _manifest.get(rel_path, f"/{STATIC_DIR}/{rel_path}")
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """Serves hashed assets with immutable caching and .br/.gz siblings."""
+
+    CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+    async def get_response(self, path: str, scope):
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if content_type.startswith("text/"):
+            content_type += "; charset=utf-8"
+        for coding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if coding not in accepted:
+                continue
+            try:
+                response = await super().get_response(path + suffix, scope)
+            except HTTPException:
+                continue
+            response.headers["Content-Encoding"] = coding
+            response.headers["Content-Type"] = content_type
+            return self._finish(response)
+        return self._finish(await super().get_response(path, scope))
+
+    def _finish(self, response):
+        response.headers["Cache-Control"] = self.CACHE_CONTROL
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
@@ -1,4 +1,5 @@
 from fasthtml.common import *
+from frontend.assets import asset_url
 
 
 def admin_page():
@@ -7,7 +8,7 @@ def admin_page():
             Meta(charset='UTF-8'),
             Meta(name='viewport', content='width=device-width, initial-scale=1.0'),
             Title('Admin - The Zitan'),
-            Link(rel='stylesheet', href='/static/css/admin.css'),
+            Link(rel='stylesheet', href=asset_url('css/admin.css')),
         ),
         Body(
             # Login overlay
@@ -144,6 +145,8 @@ def admin_page():
                         Div(id='status-breakdown', cls='status-breakdown'),
                         H2('Revenue by Payment'),
                         Div(id='payment-breakdown', cls='payment-breakdown'),
+                        H2('Top Items'),
+                        Div(id='top-items', cls='payment-breakdown'),
                         id='tab-analytics',
                         cls='tab-panel'
                     ),
@@ -386,7 +389,7 @@ def admin_page():
                 id='order-modal',
                 cls='modal hidden'
             ),
-            Script(src='/static/js/admin.js'),
+            Script(src=asset_url('js/admin.js')),
         ),
         lang='en'
     )
@@ -1,4 +1,5 @@
 from fasthtml.common import *
+from frontend.assets import asset_url
 
 
 def staff_page():
@@ -7,7 +8,7 @@ def staff_page():
             Meta(charset='UTF-8'),
             Meta(name='viewport', content='width=device-width, initial-scale=1.0'),
             Title('Kitchen Dashboard - The Zitan'),
-            Link(rel='stylesheet', href='/static/css/staff.css'),
+            Link(rel='stylesheet', href=asset_url('css/staff.css')),
         ),
         Body(
             Header(
@@ -85,7 +86,7 @@ def staff_page():
                 ),
                 cls='main-content'
             ),
-            Script(src='/static/js/staff.js'),
+            Script(src=asset_url('js/staff.js')),
         ),
         lang='en'
     )
@@ -1,12 +1,14 @@
 from fasthtml.common import *
+from frontend.assets import asset_url
 
-def tenant_page():
+def tenant_page(bootstrap: str = None):
+    """Tenant shell; `bootstrap` is a JSON catalog snapshot embedded for first paint."""
     return Html(
     Head(
         Meta(charset='UTF-8'),
         Meta(name='viewport', content='width=device-width, initial-scale=1.0'),
         Title('Zitan - Order Food'),
-        Link(rel='stylesheet', href='static/css/tenant.css'),
+        Link(rel='stylesheet', href=asset_url('css/tenant.css')),
         Base(target='_blank')
     ),
     Body(
@@ -481,7 +483,8 @@ def tenant_page():
             id='item-detail-modal',
             cls='modal hidden'
         ),
-        Script(src='static/js/tenant.js')
+        Script(NotStr(bootstrap), type='application/json', id='bootstrap-data') if bootstrap else None,
+        Script(src=asset_url('js/tenant.js'))
     ),
     lang='en'
 )
\ No newline at end of file
@@ -1,23 +1,76 @@
 import os
+from datetime import date, timedelta
 import uuid
+import hashlib
+import asyncio
+import logging
 from fasthtml.common import *
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.routing import Mount
+from starlette.responses import Response, StreamingResponse
 from frontend.pages.tenant import tenant_page
 from frontend.pages.staff import staff_page
 from frontend.pages.admin import admin_page
+from frontend.assets import build_assets, assets_version, PrecompressedStaticFiles, DIST_DIR
 from backend.services.supabase import (
     get_menu_items, create_order, get_order, get_order_by_token,
-    get_active_orders, advance_order_status, update_order,
-    get_all_menu_items, toggle_item_availability,
+    advance_order_status, update_order,
+    get_all_menu_items, get_menu_item, toggle_item_availability,
     create_menu_item, update_menu_item, delete_menu_item,
     get_categories, create_category, update_category, delete_category,
     get_settings, update_settings, get_todays_orders,
     verify_admin_password, verify_admin_token,
-    upload_menu_image,
+    upload_menu_image, upload_menu_image_variants, tenant_view, board_view, get_order_changes,
+    StatusConflict, STATUS_FLOW,
+    list_active_orders, run_active_orders_reconciler, active_orders,
+    get_daily_analytics, get_sales_report, run_daily_rollup, iter_order_pages,
+    ORDER_INTAKE, order_journal, run_order_flusher, repo,
 )
-
-app, rt = fast_app()
+from backend.services.supabase import MENU_KEY, CATEGORIES_KEY, SETTINGS_KEY
+from backend.services.cache import cache_stats, encoded
+from backend.services.events import order_events, format_sse
+from backend.services.images import build_image_variants
+from backend.services.analytics import business_date
+from backend.services.export import EXPORT_FORMATS, encode_export
+from backend.services.compression import CompressionMiddleware, compression_stats, negotiate, precompress
+from backend.services.metrics import MetricsMiddleware, METRICS_TOKEN, metrics_text
+from backend.services.tracing import JSONResponse, TracingMiddleware, start_tracing, stop_tracing, trace_routes
+from backend.services.profiling import ProfilingMiddleware, profile_path
+
+log = logging.getLogger(__name__)
+
+async def lifespan(app):
+    start_tracing()  # writer thread for the trace and slow-query files
+    # Keep the active-orders projection reconciled and close out
+    # finished business days into the daily_sales rollups
+    tasks = [asyncio.create_task(run_active_orders_reconciler()),
+             asyncio.create_task(run_daily_rollup())]
+    # Replay orders journaled before a restart, even if intake is direct now
+    if ORDER_INTAKE == "journal" or os.path.exists(order_journal.path):
+        tasks.append(asyncio.create_task(run_order_flusher()))
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await repo.aclose()
+        stop_tracing()
+
+
+app, rt = fast_app(lifespan=lifespan)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(TracingMiddleware)
+app.add_middleware(MetricsMiddleware)  # timings include compression
+app.add_middleware(ProfilingMiddleware, authorize=verify_admin_token)  # only with X-Profile + admin token
+
+# Fingerprinted, precompressed JS/CSS. Inserted at the front so it takes
+# precedence over fast_app's catch-all static-extension route and /static.
+build_assets()
+app.router.routes.insert(0, Mount(
+    "/static/dist",
+    app=PrecompressedStaticFiles(directory=DIST_DIR),
+    name="assets"
+))
 
 app.mount(
     "/static",
@@ -37,18 +90,87 @@ def check_admin(request: Request):
     return verify_admin_token(token)
 
 
+# --- Request helpers ---
+
+async def read_json(request: Request) -> dict:
+    """Parse an optional JSON body; empty or invalid bodies become {}."""
+    try:
+        body = await request.json()
+    except ValueError:
+        return {}
+    return body if isinstance(body, dict) else {}
+
+
+# --- Conditional GET helper ---
+
+def conditional_json(request: Request, key: str, data):
+    """JSON response with an ETag; answers 304 when If-None-Match matches."""
+    body, etag = encoded(key, data)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    inm = request.headers.get("if-none-match", "")
+    if etag in (t.strip().removeprefix("W/") for t in inm.split(",")) or inm.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+# --- Pre-rendered page shells ---
+
+# name -> (assets version, html bytes, digest, {coding: bytes})
+_pages: dict[str, tuple] = {}
+_page_locks: dict[str, asyncio.Lock] = {}
+
+
+def page_etag(digest: str, coding: str | None) -> str:
+    """Strong ETag of one encoding of a page: each coding is its own representation."""
+    return f'"{digest}-{coding}"' if coding else f'"{digest}"'
+
+
+def render_page(version: str, builder) -> tuple:
+    html = to_xml(builder()).encode("utf-8")
+    digest = hashlib.blake2b(html, digest_size=12).hexdigest()
+    return version, html, digest, precompress(html)
+
+
+async def cached_page(request: Request, name: str, builder, data_version: str = ""):
+    """Serve a page rendered once per asset build (and data version), with ETag/304.
+
+    Rendering and max-quality compression take a worker thread, and one
+    request per page does it while the others wait for the result.
+    """
+    version = assets_version() + data_version
+    page = _pages.get(name)
+    if page is None or page[0] != version:
+        async with _page_locks.setdefault(name, asyncio.Lock()):
+            page = _pages.get(name)
+            if page is None or page[0] != version:
+                page = _pages[name] = await asyncio.to_thread(render_page, version, builder)
+    _, html, digest, encoded = page
+
+    coding = negotiate(request.headers.get("accept-encoding", ""))
+    coding = coding if coding in encoded else None
+    headers = {"ETag": page_etag(digest, coding), "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    # Any coding's tag validates: the bytes differ, the page doesn't
+    tags = {page_etag(digest, c) for c in (None, *encoded)}
+    if not tags.isdisjoint(t.strip() for t in request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=304, headers=headers)
+    if coding:
+        headers["Content-Encoding"] = coding
+        return Response(encoded[coding], media_type="text/html; charset=utf-8", headers=headers)
+    return Response(html, media_type="text/html; charset=utf-8", headers=headers)
+
+
 # --- Menu ---
 
 @rt("/api/menu")
-def menu_api():
-    return JSONResponse(get_menu_items())
+async def menu_api(request: Request):
+    return conditional_json(request, MENU_KEY, await get_menu_items())
 
 
 # --- Settings (public — tenant needs to check accepting status) ---
 
 @rt("/api/settings")
-def settings_api():
-    return JSONResponse(get_settings())
+async def settings_api(request: Request):
+    return conditional_json(request, SETTINGS_KEY, await get_settings())
 
 
 # --- Orders ---
@@ -56,7 +178,7 @@ def settings_api():
 @rt("/api/orders", methods=["POST"])
 async def create_order_api(request: Request):
     # Guard: reject orders when restaurant is paused
-    settings = get_settings()
+    settings = await get_settings()
     if not settings or not settings.get("accepting_orders"):
         return JSONResponse(
             {"error": "The restaurant is not accepting orders right now"},
@@ -82,7 +204,7 @@ async def create_order_api(request: Request):
     payment_method = body.get("payment_method", "cash")
     gcash_ref = body.get("gcash_ref")
 
-    order = create_order(
+    order = await create_order(
         unit_number=unit_number,
         items=items,
         total=total,
@@ -98,34 +220,134 @@ async def create_order_api(request: Request):
 
 
 @rt("/api/orders/{order_id:int}")
-def get_order_api(order_id: int):
-    order = get_order(order_id)
+async def get_order_api(order_id: int):
+    order = await get_order(order_id)
     if not order:
         return JSONResponse({"error": "Order not found"}, status_code=404)
     return JSONResponse(order)
 
 
+def tracking_unavailable():
+    """The lookup failed (not "no such order"): a 503 keeps clients retrying."""
+    return JSONResponse({"error": "Order status is temporarily unavailable"}, status_code=503)
+
+
 @rt("/api/orders/track/{token}")
-def track_order_api(token: str):
-    order = get_order_by_token(token)
+async def track_order_api(token: str):
+    try:
+        order = await get_order_by_token(token)
+    except Exception:
+        return tracking_unavailable()
     if not order:
         return JSONResponse({"error": "Order not found"}, status_code=404)
     return JSONResponse(order)
 
 
+@rt("/api/orders/track/{token}/stream")
+async def track_order_stream_api(token: str, request: Request):
+    """SSE feed of one order's status transitions; closes once delivered."""
+    cursor = order_events.cursor()  # taken before the read so nothing slips between
+    try:
+        order = await get_order_by_token(token)
+    except Exception:
+        return tracking_unavailable()
+    if not order:
+        return JSONResponse({"error": "Order not found"}, status_code=404)
+
+    async def stream():
+        status = order["status"]
+        yield "retry: 5000\n\n"
+        yield format_sse((None, "status", order))
+        if status == "delivered":
+            return
+        async for item in order_events.subscribe(cursor, key=token):
+            # The bus is per process: on a heartbeat (or reset) re-read the
+            # order, so a change made by another worker still gets through
+            if item is None or item[1] == "reset":
+                try:
+                    data = await get_order_by_token(token) or {}
+                except Exception:
+                    data = {}  # next event or the client's reconnect catches up
+                if item is None and data.get("status", status) == status:
+                    yield format_sse(None)
+                    continue
+            else:
+                data = item[2]
+            if data.get("status") and data["status"] != status:
+                status = data["status"]
+                yield format_sse((None, "status", tenant_view(data)))
+                if status == "delivered":
+                    return
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @rt("/api/orders", methods=["GET"])
-def list_orders_api():
-    return JSONResponse(get_active_orders())
+async def list_orders_api(request: Request):
+    # ?since=<cursor> switches to the delta envelope; "since=" alone = snapshot
+    if "since" in request.query_params:
+        return JSONResponse(await get_order_changes(request.query_params["since"]))
+    return JSONResponse(await list_active_orders())
+
+
+@rt("/api/orders/stream")
+async def order_stream_api(request: Request):
+    """SSE feed of order created/advanced/updated events for the kitchen board.
+
+    Bus events carry the full written row (the tracking token routes them
+    to tenant streams); the board only gets what GET /api/orders shows.
+    """
+    last_event_id = request.headers.get("last-event-id") or request.query_params.get("last_event_id")
+
+    async def stream():
+        yield "retry: 3000\n\n"
+        async for item in order_events.subscribe(last_event_id):
+            if item is not None and item[1] != "reset":
+                event_id, event, data = item
+                item = event_id, event, board_view(data)
+            yield format_sse(item)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
-@rt("/api/orders/{order_id:int}/advance", methods=["POST"])
-def advance_order_api(order_id: int):
-    order = advance_order_status(order_id)
+async def advance_order_response(order_id: int, request: Request):
+    """Shared CAS advance for the kitchen and admin routes.
+
+    Body may carry {"from": <status the client displayed>}; a stale one
+    yields 409 with the current order so the client can re-render. Only a
+    missing order is a 404; a failed database call is a 503.
+    """
+    expected = (await read_json(request)).get("from")
+    if expected is not None and expected not in STATUS_FLOW:
+        return JSONResponse({"error": "Invalid status"}, status_code=400)
+    try:
+        order = await advance_order_status(order_id, expected)
+    except StatusConflict as e:
+        return JSONResponse(
+            {"error": f"Order is already {e.order['status']}", "order": e.order},
+            status_code=409,
+        )
+    except Exception:
+        # Already counted (and traced) as a service-call error
+        return JSONResponse({"error": "Orders are temporarily unavailable, please retry"}, status_code=503)
     if not order:
         return JSONResponse({"error": "Order not found"}, status_code=404)
     return JSONResponse(order)
 
 
+@rt("/api/orders/{order_id:int}/advance", methods=["POST"])
+async def advance_order_api(order_id: int, request: Request):
+    return await advance_order_response(order_id, request)
+
+
 # --- Admin auth ---
 
 @rt("/api/admin/auth", methods=["POST"])
@@ -145,10 +367,48 @@ async def admin_settings_api(request: Request):
     if not check_admin(request):
         return JSONResponse({"error": "Unauthorized"}, status_code=401)
     body = await request.json()
-    updated = update_settings(body)
+    updated = await update_settings(body)
     return JSONResponse(updated)
 
 
+# --- Admin cache / compression stats ---
+
+@rt("/api/admin/cache", methods=["GET"])
+def admin_cache_api(request: Request):
+    if not check_admin(request):
+        return JSONResponse({"error": "Unauthorized"}, status_code=401)
+    stats = {**cache_stats(), "active_orders": active_orders.stats()}
+    if ORDER_INTAKE == "journal":
+        stats["order_journal"] = order_journal.stats()
+    return JSONResponse(stats)
+
+
+@rt("/api/admin/transport", methods=["GET"])
+def admin_transport_api(request: Request):
+    """Storage backend state (Supabase: pool, breaker and retry counters)."""
+    if not check_admin(request):
+        return JSONResponse({"error": "Unauthorized"}, status_code=401)
+    return JSONResponse(repo.stats())
+
+
+@rt("/api/admin/compression", methods=["GET"])
+def admin_compression_api(request: Request):
+    if not check_admin(request):
+        return JSONResponse({"error": "Unauthorized"}, status_code=401)
+    return JSONResponse(compression_stats())
+
+
+@rt("/metrics", methods=["GET"])
+async def metrics(request: Request):
+    """Prometheus scrape target; guarded by METRICS_TOKEN when one is set.
+
+    Async so it renders on the event loop, which is the only writer.
+    """
+    if METRICS_TOKEN and request.headers.get("authorization", "") != f"Bearer {METRICS_TOKEN}":
+        return Response("Unauthorized\n", status_code=401, media_type="text/plain")
+    return Response(metrics_text(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 # --- Admin image upload ---
 
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
@@ -175,18 +435,30 @@ async def admin_upload_api(request: Request):
     filename = f"{uuid.uuid4().hex}{ext}"
 
     try:
-        url = upload_menu_image(filename, contents, ext)
+        url = await upload_menu_image(filename, contents, ext)
     except Exception as e:
         return JSONResponse({"error": f"Upload failed: {str(e)}"}, status_code=500)
 
-    return JSONResponse({"url": url})
+    # Resized WebP variants + blurred placeholder for srcset; best effort,
+    # the item still works with just the original if this fails
+    image_variants = None
+    try:
+        derived = await asyncio.to_thread(build_image_variants, contents, ext)
+        if derived:
+            variants, placeholder = derived
+            srcset = await upload_menu_image_variants(filename, variants)
+            image_variants = {"srcset": srcset, "placeholder": placeholder}
+    except Exception:
+        log.warning("image variants for %s failed; serving the original only", filename, exc_info=True)
+
+    return JSONResponse({"url": url, "image_variants": image_variants})
 
 
 # --- Categories (public) ---
 
 @rt("/api/categories")
-def categories_api():
-    return JSONResponse(get_categories())
+async def categories_api(request: Request):
+    return conditional_json(request, CATEGORIES_KEY, await get_categories())
 
 
 # --- Admin categories ---
@@ -202,7 +474,7 @@ async def admin_create_category_api(request: Request):
         return JSONResponse({"error": "Name and display name are required"}, status_code=400)
     body["name"] = name
     body["display_name"] = display_name
-    cat = create_category(body)
+    cat = await create_category(body)
     if not cat:
         return JSONResponse({"error": "Failed to create category"}, status_code=500)
     return JSONResponse(cat, status_code=201)
@@ -217,17 +489,17 @@ async def admin_update_category_api(cat_id: str, request: Request):
         body["name"] = (body["name"] or "").strip().lower().replace(" ", "-")
     if "display_name" in body:
         body["display_name"] = (body["display_name"] or "").strip()
-    cat = update_category(cat_id, body)
+    cat = await update_category(cat_id, body)
     if not cat:
         return JSONResponse({"error": "Category not found"}, status_code=404)
     return JSONResponse(cat)
 
 
 @rt("/api/admin/categories/{cat_id}", methods=["DELETE"])
-def admin_delete_category_api(cat_id: str, request: Request):
+async def admin_delete_category_api(cat_id: str, request: Request):
     if not check_admin(request):
         return JSONResponse({"error": "Unauthorized"}, status_code=401)
-    deleted = delete_category(cat_id)
+    deleted = await delete_category(cat_id)
     if not deleted:
         return JSONResponse({"error": "Category not found"}, status_code=404)
     return JSONResponse({"ok": True})
@@ -236,10 +508,20 @@ def admin_delete_category_api(cat_id: str, request: Request):
 # --- Admin menu ---
 
 @rt("/api/admin/menu", methods=["GET"])
-def admin_menu_api(request: Request):
+async def admin_menu_api(request: Request):
+    if not check_admin(request):
+        return JSONResponse({"error": "Unauthorized"}, status_code=401)
+    return JSONResponse(await get_all_menu_items())
+
+
+@rt("/api/admin/menu/{item_id}", methods=["GET"])
+async def admin_get_menu_item_api(item_id: str, request: Request):
     if not check_admin(request):
         return JSONResponse({"error": "Unauthorized"}, status_code=401)
-    return JSONResponse(get_all_menu_items())
+    item = await get_menu_item(item_id)
+    if not item:
+        return JSONResponse({"error": "Item not found"}, status_code=404)
+    return JSONResponse(item)
 
 
 @rt("/api/admin/menu", methods=["POST"])
@@ -253,7 +535,7 @@ async def admin_create_menu_api(request: Request):
     price = body.get("price")
     if price is None or float(price) < 0:
         return JSONResponse({"error": "Valid price is required"}, status_code=400)
-    item = create_menu_item(body)
+    item = await create_menu_item(body)
     if not item:
         return JSONResponse({"error": "Failed to create item"}, status_code=500)
     return JSONResponse(item, status_code=201)
@@ -264,17 +546,17 @@ async def admin_update_menu_api(item_id: str, request: Request):
     if not check_admin(request):
         return JSONResponse({"error": "Unauthorized"}, status_code=401)
     body = await request.json()
-    item = update_menu_item(item_id, body)
+    item = await update_menu_item(item_id, body)
     if not item:
         return JSONResponse({"error": "Item not found"}, status_code=404)
     return JSONResponse(item)
 
 
 @rt("/api/admin/menu/{item_id}", methods=["DELETE"])
-def admin_delete_menu_api(item_id: str, request: Request):
+async def admin_delete_menu_api(item_id: str, request: Request):
     if not check_admin(request):
         return JSONResponse({"error": "Unauthorized"}, status_code=401)
-    deleted = delete_menu_item(item_id)
+    deleted = await delete_menu_item(item_id)
     if not deleted:
         return JSONResponse({"error": "Item not found"}, status_code=404)
     return JSONResponse({"ok": True})
@@ -286,19 +568,101 @@ async def admin_toggle_menu_api(item_id: str, request: Request):
         return JSONResponse({"error": "Unauthorized"}, status_code=401)
     body = await request.json()
     is_available = body.get("is_available", True)
-    item = toggle_item_availability(item_id, is_available)
+    item = await toggle_item_availability(item_id, is_available)
     if not item:
         return JSONResponse({"error": "Item not found"}, status_code=404)
     return JSONResponse(item)
 
 
+# --- Admin dashboard snapshot ---
+
+@rt("/api/admin/snapshot")
+async def admin_snapshot_api(request: Request):
+    """Everything the dashboard loads on open, fetched upstream in parallel."""
+    if not check_admin(request):
+        return JSONResponse({"error": "Unauthorized"}, status_code=401)
+    settings, categories, menu, orders, analytics = await asyncio.gather(
+        get_settings(), get_categories(), get_all_menu_items(), get_todays_orders(),
+        get_daily_analytics())
+    return JSONResponse({
+        "settings": settings,
+        "categories": categories,
+        "menu": menu,
+        "orders": orders,
+        "analytics": analytics,
+    })
+
+
+@rt("/api/admin/analytics")
+async def admin_analytics_api(request: Request):
+    """Pre-aggregated counters for today, maintained incrementally."""
+    if not check_admin(request):
+        return JSONResponse({"error": "Unauthorized"}, status_code=401)
+    return JSONResponse(await get_daily_analytics())
+
+
+MAX_REPORT_DAYS = 366
+
+
+@rt("/api/admin/reports")
+async def admin_reports_api(request: Request):
+    """Sales for ?from=YYYY-MM-DD&to=YYYY-MM-DD, read from daily rollups only."""
+    if not check_admin(request):
+        return JSONResponse({"error": "Unauthorized"}, status_code=401)
+    params = request.query_params
+    try:
+        # Defaults: the 30 closed days before today
+        date_to = date.fromisoformat(params["to"]) if params.get("to") else business_date() - timedelta(days=1)
+        date_from = date.fromisoformat(params["from"]) if params.get("from") else date_to - timedelta(days=29)
+    except ValueError:
+        return JSONResponse({"error": "Dates must be YYYY-MM-DD"}, status_code=400)
+    if date_from > date_to or (date_to - date_from).days >= MAX_REPORT_DAYS:
+        return JSONResponse({"error": f"Invalid range (max {MAX_REPORT_DAYS} days)"}, status_code=400)
+    return JSONResponse(await get_sales_report(date_from, date_to))
+
+
 # --- Admin orders ---
 
+@rt("/api/admin/orders/export")
+async def admin_export_orders_api(request: Request):
+    """Order history as ?format=csv|ndjson line items, optional ?from=&to= days."""
+    if not check_admin(request):
+        return JSONResponse({"error": "Unauthorized"}, status_code=401)
+    params = request.query_params
+    fmt = params.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        return JSONResponse({"error": "format must be csv or ndjson"}, status_code=400)
+    try:
+        date_from = date.fromisoformat(params["from"]) if params.get("from") else None
+        date_to = date.fromisoformat(params["to"]) if params.get("to") else None
+    except ValueError:
+        return JSONResponse({"error": "Dates must be YYYY-MM-DD"}, status_code=400)
+
+    filename = f"orders_{date_from or 'start'}_{date_to or business_date()}.{fmt}"
+    return StreamingResponse(
+        encode_export(iter_order_pages(date_from, date_to), fmt),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"',
+                 "Cache-Control": "no-store"},
+    )
+
+
 @rt("/api/admin/orders/today")
-def admin_orders_today_api(request: Request):
+async def admin_orders_today_api(request: Request):
     if not check_admin(request):
         return JSONResponse({"error": "Unauthorized"}, status_code=401)
-    return JSONResponse(get_todays_orders())
+    return JSONResponse(await get_todays_orders())
+
+
+@rt("/api/admin/profiles/{name}")
+def admin_profile_api(name: str, request: Request):
+    """Download a profile saved for an X-Profile request (see X-Profile-Url)."""
+    if not check_admin(request):
+        return JSONResponse({"error": "Unauthorized"}, status_code=401)
+    path = profile_path(name)
+    if path is None:
+        return JSONResponse({"error": "Not found"}, status_code=404)
+    return FileResponse(path, media_type="application/json" if path.endswith(".json") else "text/plain")
 
 
 @rt("/api/admin/orders/{order_id:int}", methods=["PUT"])
@@ -306,35 +670,62 @@ async def admin_update_order_api(order_id: int, request: Request):
     if not check_admin(request):
         return JSONResponse({"error": "Unauthorized"}, status_code=401)
     body = await request.json()
-    order = update_order(order_id, body)
+    order = await update_order(order_id, body)
     if not order:
         return JSONResponse({"error": "Order not found or invalid data"}, status_code=404)
     return JSONResponse(order)
 
 
 @rt("/api/admin/orders/{order_id:int}/advance", methods=["POST"])
-def admin_advance_order_api(order_id: int, request: Request):
+async def admin_advance_order_api(order_id: int, request: Request):
     if not check_admin(request):
         return JSONResponse({"error": "Unauthorized"}, status_code=401)
-    order = advance_order_status(order_id)
-    if not order:
-        return JSONResponse({"error": "Order not found"}, status_code=404)
-    return JSONResponse(order)
+    return await advance_order_response(order_id, request)
 
 
 # --- Pages ---
 
+async def catalog_bootstrap():
+    """Version of the cached catalog and a builder for its JSON snapshot.
+
+    The version comes from the catalog's memoized ETags, so checking it
+    serializes nothing; the snapshot is only spliced together from the
+    encoded bodies when the tenant page is re-rendered. Returns
+    (version, builder); ("", None) if the catalog can't be loaded, in
+    which case tenant.js falls back to fetching it.
+    """
+    try:
+        categories, menu, settings = await asyncio.gather(
+            get_categories(), get_menu_items(), get_settings())
+    except Exception:
+        return "", None
+    parts = [(name, *encoded(key, value)) for name, key, value in
+             (("categories", CATEGORIES_KEY, categories), ("menu", MENU_KEY, menu),
+              ("settings", SETTINGS_KEY, settings))]
+    version = hashlib.blake2b("".join(etag for _, _, etag in parts).encode(), digest_size=8).hexdigest()
+
+    def snapshot() -> str:
+        body = b",".join(b'"%s":%s' % (name.encode(), data) for name, data, _ in parts)
+        # "</" must not appear inside a <script> element
+        return ('{"version":"%s",' % version + body.decode("utf-8") + "}").replace("</", "<\\/")
+    return version, snapshot
+
+
 @rt("/")
-def tenant():
-    return tenant_page()
+async def tenant(request: Request):
+    version, snapshot = await catalog_bootstrap()
+    return await cached_page(request, "tenant", lambda: tenant_page(snapshot() if snapshot else None), version)
 
 @rt("/staff")
-def staff():
-    return staff_page()
+async def staff(request: Request):
+    return await cached_page(request, "staff", staff_page)
 
 @rt("/admin")
-def admin():
-    return admin_page()
+async def admin(request: Request):
+    return await cached_page(request, "admin", admin_page)
+
 
+# Handler spans wrap the routes registered above
+trace_routes(app)
 
 serve()
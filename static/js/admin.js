@@ -32,6 +32,7 @@ function formatTime(dateStr) {
 let token = sessionStorage.getItem('admin_token') || null;
 let settings = null;
 let todaysOrders = [];
+let analytics = null;
 let categories = [];
 let currentOrderFilter = 'all';
 let orderSearchQuery = '';
@@ -39,6 +40,8 @@ let ordersPage = 1;
 const ORDERS_PER_PAGE = 10;
 let refreshTimer = null;
 let editingItemId = null;
+let editingImageVariants = null;
+let editingImageVariantsUrl = null; // the image_url those variants were made from
 let editingCatId = null;
 let viewingOrderId = null;
 
@@ -69,6 +72,7 @@ const els = {
     ordersEmpty: document.getElementById('orders-empty'),
     statusBreakdown: document.getElementById('status-breakdown'),
     paymentBreakdown: document.getElementById('payment-breakdown'),
+    topItems: document.getElementById('top-items'),
     // Category management
     addCategoryBtn: document.getElementById('add-category-btn'),
     categoryList: document.getElementById('category-list'),
@@ -165,7 +169,7 @@ function showDashboard() {
     els.loginOverlay.classList.add('hidden');
     els.dashboard.classList.remove('hidden');
     loadAll();
-    refreshTimer = setInterval(loadOrders, 10000);
+    refreshTimer = setInterval(refreshDashboard, 10000);
 }
 
 function handleUnauthorized() {
@@ -200,7 +204,7 @@ function switchTab(tabName) {
     });
     // Refresh data when switching to certain tabs
     if (tabName === 'orders') loadOrders();
-    if (tabName === 'analytics') loadOrders();
+    if (tabName === 'analytics') loadAnalytics();
     if (tabName === 'menu') { loadCategories(); loadMenu(); }
 }
 
@@ -208,8 +212,26 @@ function switchTab(tabName) {
 // DATA LOADING
 // ========================================
 
+// One round trip for the whole dashboard (settings, categories, menu, orders)
 async function loadAll() {
-    await Promise.all([loadSettings(), loadCategories(), loadMenu(), loadOrders()]);
+    try {
+        const res = await fetch('/api/admin/snapshot', { headers: authHeaders() });
+        if (res.status === 401) { handleUnauthorized(); return; }
+        if (!res.ok) return;
+        const snap = await res.json();
+
+        settings = snap.settings;
+        renderSettings();
+        categories = snap.categories;
+        renderCategories();
+        populateCategoryDropdown();
+        renderMenu(snap.menu);
+        todaysOrders = snap.orders;
+        renderOrders();
+        analytics = snap.analytics;
+        renderStats();
+        renderAnalytics();
+    } catch { /* silent */ }
 }
 
 async function loadSettings() {
@@ -248,11 +270,27 @@ async function loadOrders() {
         if (!res.ok) return;
         todaysOrders = await res.json();
         renderOrders();
+    } catch { /* silent */ }
+}
+
+// Server-side counters: a few hundred bytes instead of every order of the day
+async function loadAnalytics() {
+    try {
+        const res = await fetch('/api/admin/analytics', { headers: authHeaders() });
+        if (res.status === 401) { handleUnauthorized(); return; }
+        if (!res.ok) return;
+        analytics = await res.json();
         renderStats();
         renderAnalytics();
     } catch { /* silent */ }
 }
 
+// Periodic refresh: analytics always, the full order list only when shown
+function refreshDashboard() {
+    loadAnalytics();
+    if (document.getElementById('tab-orders').classList.contains('active')) loadOrders();
+}
+
 // ========================================
 // RENDER: SETTINGS
 // ========================================
@@ -505,15 +543,11 @@ function renderOrders() {
 // ========================================
 
 function renderStats() {
-    const total = todaysOrders.length;
-    const revenue = todaysOrders.reduce((sum, o) => sum + Number(o.total), 0);
-    const active = todaysOrders.filter(o => o.status !== 'delivered').length;
-    const delivered = todaysOrders.filter(o => o.status === 'delivered').length;
-
-    els.statTotal.textContent = total;
-    els.statRevenue.textContent = formatPrice(revenue);
-    els.statActive.textContent = active;
-    els.statDelivered.textContent = delivered;
+    if (!analytics) return;
+    els.statTotal.textContent = analytics.count;
+    els.statRevenue.textContent = formatPrice(analytics.revenue);
+    els.statActive.textContent = analytics.active;
+    els.statDelivered.textContent = analytics.delivered;
 }
 
 // ========================================
@@ -521,36 +555,38 @@ function renderStats() {
 // ========================================
 
 function renderAnalytics() {
-    // Status breakdown
-    const statusCounts = {};
-    STATUS_FLOW.forEach(s => statusCounts[s] = 0);
-    todaysOrders.forEach(o => {
-        if (statusCounts[o.status] !== undefined) statusCounts[o.status]++;
-    });
+    if (!analytics) return;
 
+    // Status breakdown
     els.statusBreakdown.innerHTML = STATUS_FLOW.map(s => `
         <div class="breakdown-row">
             <span class="breakdown-label">
                 <span class="status-badge ${s}">${s}</span>
             </span>
-            <span class="breakdown-count">${statusCounts[s]}</span>
+            <span class="breakdown-count">${analytics.by_status[s] || 0}</span>
         </div>
     `).join('');
 
     // Payment breakdown
-    const paymentTotals = {};
-    todaysOrders.forEach(o => {
-        const method = o.payment_method || 'cash';
-        if (!paymentTotals[method]) paymentTotals[method] = { count: 0, total: 0 };
-        paymentTotals[method].count++;
-        paymentTotals[method].total += Number(o.total);
-    });
-
-    els.paymentBreakdown.innerHTML = Object.entries(paymentTotals).map(([method, data]) => `
+    const payments = Object.entries(analytics.by_payment);
+    els.paymentBreakdown.innerHTML = payments.length ? payments.map(([method, data]) => `
         <div class="breakdown-row">
             <span class="breakdown-label">${method === 'gcash' ? 'GCash' : 'Cash'} (${data.count})</span>
             <span class="breakdown-amount">${formatPrice(data.total)}</span>
         </div>
+    `).join('') + `
+        <div class="breakdown-row">
+            <span class="breakdown-label">Average ticket</span>
+            <span class="breakdown-amount">${formatPrice(analytics.average_ticket)}</span>
+        </div>
+    ` : '<p style="color:var(--text-secondary);text-align:center;padding:1rem">No orders yet</p>';
+
+    // Top items
+    els.topItems.innerHTML = analytics.top_items.map(item => `
+        <div class="breakdown-row">
+            <span class="breakdown-label">${escapeHtml(item.name)}</span>
+            <span class="breakdown-count">${item.quantity}</span>
+        </div>
     `).join('') || '<p style="color:var(--text-secondary);text-align:center;padding:1rem">No orders yet</p>';
 }
 
@@ -736,14 +772,17 @@ function printReceipt() {
 
 async function advanceOrder(orderId) {
     try {
+        const current = todaysOrders.find(o => o.id === orderId);
         const res = await fetch(`/api/admin/orders/${orderId}/advance`, {
             method: 'POST',
             headers: authHeaders(),
+            body: JSON.stringify({ from: current ? current.status : undefined }),
         });
         if (res.status === 401) { handleUnauthorized(); return; }
-        if (!res.ok) return;
+        // 409: changed elsewhere — fall through to reload and show the latest
+        if (!res.ok && res.status !== 409) return;
 
-        await loadOrders();
+        await Promise.all([loadOrders(), loadAnalytics()]);
 
         // Refresh modal if still open
         if (viewingOrderId === orderId) {
@@ -773,6 +812,8 @@ function openItemModal(item) {
         els.itemPrice.value = item.price || '';
         els.itemCategory.value = item.category || defaultCat;
         els.itemImage.value = item.image_url || '';
+        editingImageVariants = item.image_variants || null;
+        editingImageVariantsUrl = item.image_url || null;
         els.deleteItemBtn.classList.remove('hidden');
         showImagePreview(item.image_url);
     } else {
@@ -783,6 +824,8 @@ function openItemModal(item) {
         els.itemPrice.value = '';
         els.itemCategory.value = defaultCat;
         els.itemImage.value = '';
+        editingImageVariants = null;
+        editingImageVariantsUrl = null;
         els.deleteItemBtn.classList.add('hidden');
         showImagePreview(null);
     }
@@ -819,8 +862,7 @@ async function uploadImage(file) {
         return null;
     }
 
-    const data = await res.json();
-    return data.url;
+    return await res.json();
 }
 
 function closeItemModal() {
@@ -846,10 +888,14 @@ async function saveItem() {
         if (fileInput.files && fileInput.files[0]) {
             const uploaded = await uploadImage(fileInput.files[0]);
             if (uploaded === null) return;
-            image_url = uploaded;
+            image_url = uploaded.url;
+            editingImageVariants = uploaded.image_variants || null;
+            editingImageVariantsUrl = image_url;
         }
 
-        const body = { name, description, price, category, image_url };
+        // A hand-typed URL replaces the picture, so the old srcset must go too
+        const image_variants = image_url && image_url === editingImageVariantsUrl ? editingImageVariants : null;
+        const body = { name, description, price, category, image_url, image_variants };
 
         let res;
         if (editingItemId) {
@@ -949,11 +995,10 @@ async function toggleMenuItem(itemId, isAvailable) {
 
 async function fetchItemForEdit(itemId) {
     try {
-        const res = await fetch('/api/admin/menu', { headers: authHeaders() });
+        const res = await fetch(`/api/admin/menu/${encodeURIComponent(itemId)}`, { headers: authHeaders() });
         if (res.status === 401) { handleUnauthorized(); return null; }
         if (!res.ok) return null;
-        const items = await res.json();
-        return items.find(i => String(i.id) === String(itemId)) || null;
+        return await res.json();
     } catch { return null; }
 }
 
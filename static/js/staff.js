@@ -3,7 +3,10 @@
 // ========================================
 
 const CURRENCY = '\u20B1';
-const POLL_INTERVAL = 5000;
+const POLL_INTERVAL = 5000; // fallback only, when EventSource is unavailable
+// The stream only carries this worker's writes; a slow delta poll alongside
+// it picks up orders created or advanced on other workers
+const SYNC_INTERVAL = 15000;
 
 function formatPrice(amount) {
     return `${CURRENCY}${Number(amount).toLocaleString('en-PH', {
@@ -52,6 +55,8 @@ const colTabs = document.querySelectorAll('.col-tab');
 const orderColumns = document.querySelectorAll('.order-column');
 
 let activeTab = 'new';
+let ordersById = new Map();
+let feedCursor = null;
 
 // ========================================
 // MOBILE TABS
@@ -152,21 +157,69 @@ function renderOrders(orders) {
     activeCount.textContent = total;
 }
 
+function renderBoard() {
+    const orders = [...ordersById.values()]
+        .sort((a, b) => new Date(a.created_at) - new Date(b.created_at));
+    renderOrders(orders);
+}
+
+function applyOrder(order) {
+    if (order.status === 'delivered') {
+        ordersById.delete(order.id);
+    } else {
+        ordersById.set(order.id, order);
+    }
+}
+
 // ========================================
 // API
 // ========================================
 
+// Fetch only what changed since `feedCursor` (a full snapshot when null)
+// and merge it into the board
 async function fetchOrders() {
     try {
-        const res = await fetch('/api/orders');
+        const res = await fetch(`/api/orders?since=${encodeURIComponent(feedCursor || '')}`);
         if (!res.ok) return;
-        const orders = await res.json();
-        renderOrders(orders);
+        const delta = await res.json();
+        if (delta.full) ordersById = new Map();
+        delta.orders.forEach(applyOrder);
+        delta.removed.forEach(id => ordersById.delete(id));
+        feedCursor = delta.cursor;
+        renderBoard();
     } catch {
         // Silently retry next interval
     }
 }
 
+// ========================================
+// LIVE UPDATES (Server-Sent Events)
+// ========================================
+
+function connectStream() {
+    const source = new EventSource('/api/orders/stream');
+    let synced = false;
+
+    // Load the full board once the stream is live so no event falls in
+    // between; later reconnects resume via Last-Event-ID instead.
+    source.addEventListener('open', () => {
+        if (!synced) {
+            synced = true;
+            fetchOrders();
+        }
+    });
+
+    ['created', 'advanced', 'updated'].forEach(type => {
+        source.addEventListener(type, (e) => {
+            applyOrder(JSON.parse(e.data));
+            renderBoard();
+        });
+    });
+
+    // Server restarted or our cursor fell out of its buffer — resync
+    source.addEventListener('reset', fetchOrders);
+}
+
 async function advanceOrder(orderId) {
     const btn = document.querySelector(`[data-order-id="${orderId}"]`);
     if (btn) {
@@ -175,14 +228,27 @@ async function advanceOrder(orderId) {
     }
 
     try {
-        const res = await fetch(`/api/orders/${orderId}/advance`, { method: 'POST' });
+        const current = ordersById.get(orderId);
+        const res = await fetch(`/api/orders/${orderId}/advance`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ from: current ? current.status : undefined })
+        });
+        if (res.status === 409) {
+            // Someone else advanced it first — show where it actually is
+            const err = await res.json();
+            applyOrder(err.order);
+            renderBoard();
+            return;
+        }
         if (!res.ok) {
             const err = await res.json();
             alert(err.error || 'Failed to update order');
             return;
         }
-        // Refresh immediately after advancing
-        await fetchOrders();
+        // Apply immediately; the stream event for it is idempotent
+        applyOrder(await res.json());
+        renderBoard();
     } catch {
         alert('Connection error. Please try again.');
     } finally {
@@ -196,5 +262,10 @@ async function advanceOrder(orderId) {
 // INIT
 // ========================================
 
-fetchOrders();
-setInterval(fetchOrders, POLL_INTERVAL);
+if ('EventSource' in window) {
+    connectStream();
+    setInterval(fetchOrders, SYNC_INTERVAL);
+} else {
+    fetchOrders();
+    setInterval(fetchOrders, POLL_INTERVAL);
+}
@@ -16,37 +16,68 @@ let menuItems = [];
 let menuCategories = [];
 let restaurantSettings = null;
 
+// Conditional GET: replay the stored ETag, reuse the stored body on 304
+const VALIDATOR_PREFIX = 'zitan_cache:';
+
+async function fetchWithValidator(url) {
+    const key = VALIDATOR_PREFIX + url;
+    let cached = null;
+    try { cached = JSON.parse(localStorage.getItem(key)); } catch { /* ignore */ }
+
+    const headers = cached && cached.etag ? { 'If-None-Match': cached.etag } : {};
+    const res = await fetch(url, { headers, cache: 'no-store' });
+    if (res.status === 304 && cached) return cached.data;
+    if (!res.ok) throw new Error(`${url} failed: ${res.status}`);
+
+    const data = await res.json();
+    const etag = res.headers.get('ETag');
+    if (etag) {
+        try {
+            localStorage.setItem(key, JSON.stringify({ etag, data }));
+        } catch { /* quota exceeded — skip caching */ }
+    }
+    return data;
+}
+
 async function fetchMenuItems() {
-    const res = await fetch("/api/menu");
-    if (!res.ok) {
+    try {
+        return await fetchWithValidator('/api/menu');
+    } catch {
         console.error("Failed to fetch menu items");
         return [];
     }
-    return await res.json();
 }
 
 async function fetchCategories() {
     try {
-        const res = await fetch('/api/categories');
-        if (!res.ok) return [];
-        return await res.json();
+        return await fetchWithValidator('/api/categories');
     } catch { return []; }
 }
 
+function applyRestaurantStatus() {
+    const banner = document.getElementById('paused-banner');
+    if (!restaurantSettings.accepting_orders) {
+        banner.classList.remove('hidden');
+    } else {
+        banner.classList.add('hidden');
+    }
+}
+
 async function checkRestaurantStatus() {
     try {
-        const res = await fetch('/api/settings');
-        if (!res.ok) return;
-        restaurantSettings = await res.json();
-        const banner = document.getElementById('paused-banner');
-        if (!restaurantSettings.accepting_orders) {
-            banner.classList.remove('hidden');
-        } else {
-            banner.classList.add('hidden');
-        }
+        restaurantSettings = await fetchWithValidator('/api/settings');
+        applyRestaurantStatus();
     } catch { /* silent */ }
 }
 
+// Catalog snapshot embedded by the server (categories, menu, settings).
+// The page is revalidated by ETag, so a snapshot is always current.
+function readBootstrap() {
+    const el = document.getElementById('bootstrap-data');
+    if (!el) return null;
+    try { return JSON.parse(el.textContent); } catch { return null; }
+}
+
 
 // App State
 let cart = {}; // { itemId: { quantity, notes } }
@@ -120,11 +151,21 @@ const elements = {
 // INITIALIZATION
 // ========================================
 async function init() {
-    await checkRestaurantStatus();
-    menuCategories = await fetchCategories();
-    renderCategoryTabs();
-    menuItems = await fetchMenuItems();
-    renderMenu();
+    const bootstrap = readBootstrap();
+    if (bootstrap) {
+        restaurantSettings = bootstrap.settings;
+        if (restaurantSettings) applyRestaurantStatus();
+        menuCategories = bootstrap.categories || [];
+        renderCategoryTabs();
+        menuItems = bootstrap.menu || [];
+        renderMenu();
+    } else {
+        await checkRestaurantStatus();
+        menuCategories = await fetchCategories();
+        renderCategoryTabs();
+        menuItems = await fetchMenuItems();
+        renderMenu();
+    }
     setupEventListeners();
 
     // Resume tracking if we have a saved token
@@ -181,6 +222,25 @@ function renderCategoryTabs() {
 // ========================================
 // MENU FUNCTIONS
 // ========================================
+
+// Card image slots: 96px list on phones, 2 columns from 480px, 3 from 768px
+const MENU_IMAGE_SIZES = '(min-width: 768px) 280px, (min-width: 480px) 50vw, 96px';
+
+// <img> attributes using the upload-time WebP variants when the item has them
+function menuImageAttrs(item, sizes, withPlaceholder = true) {
+    const fallback = item.image_url || '/static/images/placeholder.png';
+    const variants = item.image_variants;
+    if (!variants || !variants.srcset || !variants.srcset.length) {
+        return `src="${fallback}"`;
+    }
+    const srcset = variants.srcset.map(v => `${v.url} ${v.w}w`).join(', ');
+    const smallest = variants.srcset.reduce((a, b) => (a.w <= b.w ? a : b));
+    const blur = withPlaceholder && variants.placeholder
+        ? ` style="background:url('${variants.placeholder}') center/cover"`
+        : '';
+    return `src="${smallest.url}" srcset="${srcset}" sizes="${sizes}"${blur}`;
+}
+
 function renderMenu() {
     // When searching, ignore category filter so results come from all categories
     let filteredItems;
@@ -217,9 +277,10 @@ function renderMenu() {
             <div class="food-card" data-id="${item.id}">
                 <div class="food-image">
                     <img
-                        src="${item.image_url || '/static/images/placeholder.png'}"
+                        ${menuImageAttrs(item, MENU_IMAGE_SIZES)}
                         alt="${item.name}"
                         loading="lazy"
+                        decoding="async"
                     />
                 </div>
                 <div class="food-info">
@@ -367,7 +428,7 @@ function renderCart() {
 
             return `
                 <div class="cart-item" data-id="${item.id}">
-                    <div class="cart-item-image"><img src="${item.image_url || '/static/images/placeholder.png'}" alt="${item.name}" style="width:100%;height:100%;object-fit:cover;border-radius:var(--radius)"></div>
+                    <div class="cart-item-image"><img ${menuImageAttrs(item, '64px', false)} alt="${item.name}" style="width:100%;height:100%;object-fit:cover;border-radius:var(--radius)"></div>
                     <div class="cart-item-details">
                         <h4 class="cart-item-name">${item.name}</h4>
                         ${cartItem.notes ? `<p class="cart-item-notes">"${cartItem.notes}"</p>` : ''}
@@ -589,6 +650,13 @@ function openItemDetail(itemId) {
 
     detailItemId = itemId;
     elements.detailName.textContent = item.name;
+    const variants = item.image_variants && item.image_variants.srcset;
+    if (variants && variants.length) {
+        elements.detailImage.srcset = variants.map(v => `${v.url} ${v.w}w`).join(', ');
+        elements.detailImage.sizes = '(min-width: 480px) 480px, 100vw';
+    } else {
+        elements.detailImage.removeAttribute('srcset');
+    }
     elements.detailImage.src = item.image_url || '/static/images/placeholder.png';
     elements.detailImage.alt = item.name;
     elements.detailDescription.textContent = item.description || '';
@@ -758,6 +826,7 @@ const STATUS_MAP = {
 };
 
 let statusPollTimer = null;
+let statusStream = null;
 
 function renderOrderStatus() {
     elements.orderNumber.textContent = currentOrder.orderNumber;
@@ -800,9 +869,44 @@ function applyStatusUI(status) {
     }
 }
 
+function stopStatusUpdates() {
+    if (statusStream) {
+        statusStream.close();
+        statusStream = null;
+    }
+    if (statusPollTimer) {
+        clearInterval(statusPollTimer);
+        statusPollTimer = null;
+    }
+}
+
 function startStatusPolling() {
-    if (statusPollTimer) clearInterval(statusPollTimer);
+    stopStatusUpdates();
 
+    // Prefer the push stream; the server closes it once delivered
+    if ('EventSource' in window && currentOrder && currentOrder.trackingToken) {
+        statusStream = new EventSource(`/api/orders/track/${currentOrder.trackingToken}/stream`);
+        statusStream.addEventListener('status', (e) => {
+            const order = JSON.parse(e.data);
+            currentOrder.status = order.status;
+            applyStatusUI(order.status);
+            if (order.status === 'delivered') stopStatusUpdates();
+        });
+        // EventSource gives up for good on a non-200 reconnect (e.g. 503
+        // while the database is unreachable); fall back to polling
+        statusStream.addEventListener('error', () => {
+            if (statusStream && statusStream.readyState === EventSource.CLOSED) {
+                statusStream = null;
+                startPollingLoop();
+            }
+        });
+        return;
+    }
+
+    startPollingLoop();
+}
+
+function startPollingLoop() {
     statusPollTimer = setInterval(async () => {
         if (!currentOrder || !currentOrder.trackingToken) {
             clearInterval(statusPollTimer);
@@ -918,10 +1022,7 @@ function setupEventListeners() {
     elements.browseMenuBtn.addEventListener('click', () => showScreen('menu'));
     
     elements.newOrderBtn.addEventListener('click', () => {
-        if (statusPollTimer) {
-            clearInterval(statusPollTimer);
-            statusPollTimer = null;
-        }
+        stopStatusUpdates();
         localStorage.removeItem(TRACKING_KEY);
         currentOrder = null;
         cart = {};
@@ -0,0 +1,9 @@
+import os
+import tempfile
+
+# backend.services.supabase builds its repository at import: point it at a
+# throwaway SQLite file, and keep the admin token secret out of data/
+_scratch = tempfile.mkdtemp()
+os.environ.setdefault("STORAGE_BACKEND", "sqlite")
+os.environ.setdefault("SQLITE_PATH", os.path.join(_scratch, "resto.db"))
+os.environ.setdefault("ADMIN_TOKEN_SECRET_PATH", os.path.join(_scratch, "admin_token.key"))
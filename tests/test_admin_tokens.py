@@ -0,0 +1,54 @@
+import os
+import time
+
+from backend.services import supabase
+
+
+def test_issued_token_verifies():
+    token = supabase.verify_admin_password(supabase.ADMIN_PASSWORD)
+    assert token
+    assert supabase.verify_admin_token(token)
+
+
+def test_wrong_password_issues_nothing():
+    assert supabase.verify_admin_password(supabase.ADMIN_PASSWORD + "x") is None
+
+
+def test_expired_token_is_refused(monkeypatch):
+    monkeypatch.setattr(supabase, "ADMIN_TOKEN_TTL", -1)
+    token = supabase.verify_admin_password(supabase.ADMIN_PASSWORD)
+    assert not supabase.verify_admin_token(token)
+
+
+def test_tampered_tokens_are_refused():
+    token = supabase.verify_admin_password(supabase.ADMIN_PASSWORD)
+    expires, nonce, sig = token.split(".")
+    later = str(int(expires) + 3600)
+    assert not supabase.verify_admin_token(f"{later}.{nonce}.{sig}")
+    assert not supabase.verify_admin_token(f"{expires}.{nonce}x.{sig}")
+    assert not supabase.verify_admin_token(f"{expires}.{nonce}.{sig[:-2]}")
+    assert not supabase.verify_admin_token(f"{expires}.{nonce}.")
+    assert not supabase.verify_admin_token("")
+    assert not supabase.verify_admin_token("not-a-token")
+
+
+def test_token_signed_with_another_key_is_refused(monkeypatch):
+    token = supabase.verify_admin_password(supabase.ADMIN_PASSWORD)
+    monkeypatch.setattr(supabase, "_TOKEN_KEY", b"some other key")
+    assert not supabase.verify_admin_token(token)
+
+
+def test_local_secret_is_random_and_persisted(tmp_path):
+    path = str(tmp_path / "keys" / "admin_token.key")
+    first = supabase._local_token_secret(path)
+    assert len(first) == 64
+    assert supabase._local_token_secret(path) == first
+    assert os.stat(path).st_mode & 0o077 == 0
+    assert supabase._local_token_secret(str(tmp_path / "other.key")) != first
+
+
+def test_verification_checks_expiry_at_call_time(monkeypatch):
+    token = supabase.verify_admin_password(supabase.ADMIN_PASSWORD)
+    expires = int(token.split(".")[0])
+    monkeypatch.setattr(time, "time", lambda: expires + 1)
+    assert not supabase.verify_admin_token(token)
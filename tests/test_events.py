@@ -0,0 +1,78 @@
+import asyncio
+
+from backend.services.events import EventBus
+
+
+async def take(stream, n: int) -> list:
+    return [await asyncio.wait_for(anext(stream), 1) for _ in range(n)]
+
+
+def test_resume_replays_only_newer_events():
+    bus = EventBus(key_field="tracking_token")
+    bus.publish("created", {"id": 1})
+    cursor = bus.cursor()
+    bus.publish("advanced", {"id": 1, "status": "preparing"})
+    bus.publish("created", {"id": 2})
+
+    async def run():
+        stream = bus.subscribe(cursor)
+        try:
+            return await take(stream, 2)
+        finally:
+            await stream.aclose()
+
+    events = asyncio.run(run())
+    assert [(event, data["id"]) for _, event, data in events] == [("advanced", 1), ("created", 2)]
+    assert events[-1][0] == bus.cursor()
+
+
+def test_unknown_cursor_gets_a_reset():
+    bus = EventBus()
+    bus.publish("created", {"id": 1})
+
+    async def run(last_event_id):
+        stream = bus.subscribe(last_event_id)
+        try:
+            return (await take(stream, 1))[0]
+        finally:
+            await stream.aclose()
+
+    for stale in ("0-1", f"{bus.epoch}-99", f"{bus.epoch}-x"):
+        event_id, event, data = asyncio.run(run(stale))
+        assert (event_id, event, data) == (bus.cursor(), "reset", {})
+
+
+def test_evicted_cursor_gets_a_reset():
+    bus = EventBus(maxlen=2)
+    bus.publish("created", {"id": 1})
+    cursor = bus.cursor()
+    for n in range(2, 5):
+        bus.publish("created", {"id": n})
+
+    async def run():
+        stream = bus.subscribe(cursor)
+        try:
+            return (await take(stream, 1))[0]
+        finally:
+            await stream.aclose()
+
+    assert asyncio.run(run())[1] == "reset"
+
+
+def test_keyed_subscriber_sees_only_its_order():
+    bus = EventBus(key_field="tracking_token")
+
+    async def run():
+        stream = bus.subscribe(bus.cursor(), key="a")
+        first = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        bus.publish("advanced", {"tracking_token": "b", "status": "ready"})
+        bus.publish("advanced", {"tracking_token": "a", "status": "preparing"})
+        try:
+            return await asyncio.wait_for(first, 1)
+        finally:
+            await stream.aclose()
+
+    _, event, data = asyncio.run(run())
+    assert data == {"tracking_token": "a", "status": "preparing"}
+    assert bus.subscriber_count == 0
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from backend.services import supabase
+from backend.services.supabase import StatusConflict
+
+
+def new_order() -> dict:
+    return asyncio.run(supabase.create_order("12a", [{"name": "Adobo", "qty": 1, "price": 120}], 120))
+
+
+def test_advance_moves_one_step():
+    order = new_order()
+    advanced = asyncio.run(supabase.advance_order_status(order["id"], "new"))
+    assert advanced["status"] == "preparing"
+
+
+def test_stale_expected_status_conflicts_with_current_order():
+    order = new_order()
+    asyncio.run(supabase.advance_order_status(order["id"], "new"))
+    with pytest.raises(StatusConflict) as conflict:
+        asyncio.run(supabase.advance_order_status(order["id"], "new"))
+    assert conflict.value.order["id"] == order["id"]
+    assert conflict.value.order["status"] == "preparing"
+
+
+def test_only_one_of_two_racing_taps_advances():
+    order = new_order()
+
+    async def race():
+        return await asyncio.gather(
+            supabase.advance_order_status(order["id"], "new"),
+            supabase.advance_order_status(order["id"], "new"),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(race())
+    assert sum(isinstance(r, StatusConflict) for r in results) == 1
+    assert [r["status"] for r in results if isinstance(r, dict)] == ["preparing"]
+
+
+def test_missing_order_is_none():
+    assert asyncio.run(supabase.advance_order_status(999999, "new")) is None
+
+
+def test_failed_read_after_lost_cas_raises(monkeypatch):
+    order = new_order()
+    asyncio.run(supabase.advance_order_status(order["id"], "new"))
+
+    async def unavailable(order_id):
+        raise ConnectionError("database unavailable")
+
+    monkeypatch.setattr(supabase, "get_order", unavailable)
+    with pytest.raises(ConnectionError):
+        asyncio.run(supabase.advance_order_status(order["id"], "new"))
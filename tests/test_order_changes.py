@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from backend.services import supabase
+from backend.services.projection import ActiveOrders
+
+
+@pytest.fixture
+def from_database(monkeypatch):
+    """Serve get_order_changes() the way it runs before the projection loads."""
+    monkeypatch.setattr(supabase, "active_orders", ActiveOrders(supabase._ACTIVE_ORDER_FIELDS.split(",")))
+
+
+def new_order() -> dict:
+    return asyncio.run(supabase.create_order("7b", [{"name": "Sinigang", "qty": 1, "price": 150}], 150))
+
+
+def test_snapshot_then_deltas(from_database):
+    order = new_order()
+    snapshot = asyncio.run(supabase.get_order_changes(""))
+    assert snapshot["full"]
+    assert order["id"] in [o["id"] for o in snapshot["orders"]]
+    assert "tracking_token" not in snapshot["orders"][0]
+
+    advanced = asyncio.run(supabase.advance_order_status(order["id"], "new"))
+    delta = asyncio.run(supabase.get_order_changes(snapshot["cursor"]))
+    assert not delta["full"]
+    assert advanced["id"] in [o["id"] for o in delta["orders"]]
+    assert delta["cursor"] >= snapshot["cursor"]
+
+
+def test_overlap_resends_changes_at_the_cursor(from_database):
+    order = new_order()
+    delta = asyncio.run(supabase.get_order_changes(order["updated_at"]))
+    assert order["id"] in [o["id"] for o in delta["orders"]]
+
+
+def test_delivered_order_is_reported_removed(from_database):
+    order = new_order()
+    cursor = asyncio.run(supabase.get_order_changes(""))["cursor"]
+    for status in ("new", "preparing", "ready"):
+        asyncio.run(supabase.advance_order_status(order["id"], status))
+    delta = asyncio.run(supabase.get_order_changes(cursor))
+    assert order["id"] in delta["removed"]
+    assert order["id"] not in [o["id"] for o in delta["orders"]]
+
+
+def test_unparseable_cursor_gets_a_snapshot(from_database):
+    assert asyncio.run(supabase.get_order_changes("yesterday"))["full"]
@@ -0,0 +1,53 @@
+import asyncio
+
+from backend.services import supabase
+from backend.services.journal import OrderJournal
+from backend.services.repository import Rejected
+
+
+class StubRepo:
+    """Accepts any batch without a bad row; a bad row fails its whole batch."""
+
+    def __init__(self):
+        self.calls = 0
+        self.next_id = 1
+
+    async def insert_orders_once(self, rows):
+        self.calls += 1
+        if any(row.get("bad") for row in rows):
+            raise Rejected("violates check constraint")
+        inserted = []
+        for row in rows:
+            inserted.append({**row, "id": self.next_id})
+            self.next_id += 1
+        return inserted
+
+
+def order(n: int, bad: bool = False) -> dict:
+    return {"tracking_token": f"token-{n}", "bad": bad}
+
+
+def test_good_order_flushes_behind_rejected_ones(tmp_path, monkeypatch):
+    journal = OrderJournal(str(tmp_path / "journal.db"))
+    repo, created = StubRepo(), []
+    monkeypatch.setattr(supabase, "JOURNAL_BATCH_SIZE", 3)
+    monkeypatch.setattr(supabase, "order_journal", journal)
+    monkeypatch.setattr(supabase, "repo", repo)
+    monkeypatch.setattr(supabase, "_order_changed", lambda event, row: created.append(row["tracking_token"]))
+
+    async def run():
+        for n in range(5):
+            await journal.append(order(n, bad=True))
+        await journal.append(order(5))
+        return await supabase.flush_order_journal()
+
+    assert asyncio.run(run()) == 1
+    assert created == ["token-5"]
+    stats = journal.stats()
+    assert stats["pending"] == 0
+    assert stats["rejected"] == 5
+
+    # Rejected rows are out of the queue: the next flush sends nothing
+    calls = repo.calls
+    assert asyncio.run(supabase.flush_order_journal()) == 0
+    assert repo.calls == calls
@@ -0,0 +1,57 @@
+import time
+
+from backend.services.projection import ActiveOrders
+
+FIELDS = ["id", "status", "created_at", "updated_at"]
+
+
+def order(order_id: int, status: str = "new") -> dict:
+    return {"id": order_id, "status": status, "created_at": f"2026-01-01T00:00:0{order_id}+00:00",
+            "updated_at": None, "tracking_token": "secret"}
+
+
+def loaded(*rows) -> ActiveOrders:
+    projection = ActiveOrders(FIELDS)
+    projection.replace(list(rows), time.monotonic())
+    projection._horizon -= 60  # as if loaded a minute ago
+    return projection
+
+
+def test_not_loaded_has_no_changes():
+    assert ActiveOrders(FIELDS).changes_since(0) is None
+
+
+def test_cursor_before_history_needs_a_snapshot():
+    projection = loaded(order(1))
+    assert projection.changes_since(time.time() - 3600) is None
+
+
+def test_changes_and_removals_since_cursor():
+    projection = loaded(order(1), order(2), order(3))
+    since = time.time()
+    projection.apply(order(1, "preparing"))
+    projection.apply(order(2, "delivered"))
+
+    changed, removed = projection.changes_since(since)
+    assert changed == [{"id": 1, "status": "preparing", "created_at": order(1)["created_at"], "updated_at": None}]
+    assert removed == [2]
+    assert [o["id"] for o in projection.orders()] == [1, 3]
+    assert projection.changes_since(time.time() + 1) == ([], [])
+
+
+def test_reconcile_records_changes_made_elsewhere():
+    projection = loaded(order(1), order(2), order(3))
+    since = time.time()
+    projection.replace([order(1), order(2, "ready"), order(4)], time.monotonic())
+
+    changed, removed = projection.changes_since(since)
+    assert sorted(o["id"] for o in changed) == [2, 4]
+    assert removed == [3]
+
+
+def test_local_write_during_reconcile_read_wins():
+    projection = loaded(order(1))
+    started = time.monotonic()
+    projection.apply(order(1, "preparing"))
+    projection.replace([order(1)], started)  # snapshot read before the write
+    assert projection.orders()[0]["status"] == "preparing"